@@ -4,12 +4,13 @@ from sqlalchemy import pool  # type: ignore
 from alembic import context  # type: ignore
 import os
 import sys
-from dotenv import load_dotenv
 
 # Add parent directory to path
 sys.path.insert(0, os.path.dirname(os.path.dirname(__file__)))
 
-load_dotenv()
+from backend.utils.env import load_env
+
+load_env()
 
 # Import your models and Base
 from backend.db import Base
@@ -37,7 +38,7 @@ MYSQL_PASSWORD = os.getenv("MYSQL_PASSWORD", "adminadmin")
 MYSQL_DATABASE = os.getenv("MYSQL_DATABASE", "leave_management_db")
 
 # Alembic runs synchronously; use sync driver (pymysql) for migrations.
-# The app uses mysql+aiomysql at runtime.
+# The app uses mysql+asyncmy (or MYSQL_ASYNC_DRIVER) at runtime.
 SYNC_DATABASE_URL = (
     f"mysql+pymysql://{MYSQL_USER}:{MYSQL_PASSWORD}@{MYSQL_HOST}:{MYSQL_PORT}/{MYSQL_DATABASE}?charset=utf8mb4"
 )
@@ -7,6 +7,7 @@ Create Date: Add actor_*, summary, request_method, request_path to audit_logs
 """
 from alembic import op  # type: ignore
 import sqlalchemy as sa  # type: ignore
+from backend.utils.schema_snapshot import alter_table_online, get_schema_snapshot
 
 
 # revision identifiers, used by Alembic.
@@ -27,40 +28,26 @@ _COLUMNS = [
 ]
 
 
-def _column_exists(conn, table: str, column: str) -> bool:
-    r = conn.execute(
-        sa.text(
-            "SELECT 1 FROM information_schema.COLUMNS "
-            "WHERE TABLE_SCHEMA = DATABASE() AND TABLE_NAME = :t AND COLUMN_NAME = :c"
-        ),
-        {"t": table, "c": column},
-    ).scalar()
-    return r is not None
-
-
-def _index_exists(conn, index: str, table: str) -> bool:
-    r = conn.execute(
-        sa.text(
-            "SELECT 1 FROM information_schema.STATISTICS "
-            "WHERE TABLE_SCHEMA = DATABASE() AND TABLE_NAME = :t AND INDEX_NAME = :idx"
-        ),
-        {"t": table, "idx": index},
-    ).scalar()
-    return r is not None
-
-
 def upgrade() -> None:
     conn = op.get_bind()
-    for name, col_type, comment in _COLUMNS:
-        if not _column_exists(conn, "audit_logs", name):
-            op.add_column(
-                "audit_logs",
-                sa.Column(name, col_type, nullable=True, comment=comment),
-            )
-    if not _index_exists(conn, "idx_actor_email", "audit_logs"):
-        op.create_index("idx_actor_email", "audit_logs", ["actor_email"], unique=False)
-    if not _index_exists(conn, "idx_created_at_action", "audit_logs"):
-        op.create_index("idx_created_at_action", "audit_logs", ["created_at", "action"], unique=False)
+    snapshot = get_schema_snapshot(conn)
+    new_columns = [c for c in _COLUMNS if not snapshot.has_column("audit_logs", c[0])]
+    new_indexes = [
+        (name, cols)
+        for name, cols in (("idx_actor_email", "actor_email"), ("idx_created_at_action", "created_at, action"))
+        if not snapshot.has_index("audit_logs", name)
+    ]
+    clauses = []
+    for name, col_type, comment in new_columns:
+        type_sql = col_type.compile(dialect=conn.dialect)
+        clauses.append(f"ADD COLUMN `{name}` {type_sql} NULL COMMENT '{comment}'")
+    for name, cols in new_indexes:
+        clauses.append(f"ADD INDEX {name} ({cols})")
+    if clauses:
+        # INSTANT only applies to column-only changes; with an ADD INDEX go straight to online INPLACE
+        alter_table_online(conn, "audit_logs", clauses, instant=not new_indexes)
+        snapshot.add_columns("audit_logs", [c[0] for c in new_columns])
+        snapshot.add_indexes("audit_logs", [name for name, _ in new_indexes])
 
 
 def downgrade() -> None:
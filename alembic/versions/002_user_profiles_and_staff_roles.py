@@ -8,6 +8,7 @@ Create Date: user_profiles (1:1), staff_roles (one table for non-employee roles)
 from alembic import op  # type: ignore
 import sqlalchemy as sa  # type: ignore
 from sqlalchemy import text  # type: ignore
+from backend.utils.schema_snapshot import alter_table_online, get_schema_snapshot
 
 
 # revision identifiers, used by Alembic.
@@ -16,34 +17,87 @@ down_revision = "001_audit_detail"
 branch_labels = None
 depends_on = None
 
+# Profile columns moved from users to user_profiles: (name, type)
+_PROFILE_COLUMNS = [
+    ("profile_picture_url", sa.String(500)),
+    ("dob", sa.Date()),
+    ("blood_group", sa.String(10)),
+    ("address", sa.Text()),
+    ("permanent_address", sa.Text()),
+    ("father_name", sa.String(255)),
+    ("father_dob", sa.Date()),
+    ("mother_name", sa.String(255)),
+    ("mother_dob", sa.Date()),
+    ("spouse_name", sa.String(255)),
+    ("spouse_dob", sa.Date()),
+    ("children_names", sa.Text()),
+    ("emergency_contact_name", sa.String(255)),
+    ("emergency_contact_phone", sa.String(20)),
+]
+
+# Rows per batch when copying profile data between users and user_profiles
+_COPY_BATCH_SIZE = 10000
+
+_PROFILE_COPY_SQL = """
+    INSERT INTO user_profiles (user_id, profile_picture_url, dob, blood_group, address, permanent_address,
+        father_name, father_dob, mother_name, mother_dob, spouse_name, spouse_dob, children_names,
+        emergency_contact_name, emergency_contact_phone, created_at, updated_at)
+    SELECT id, profile_picture_url, dob, blood_group, address, permanent_address,
+        father_name, father_dob, mother_name, mother_dob, spouse_name, spouse_dob, children_names,
+        emergency_contact_name, emergency_contact_phone, created_at, updated_at
+    FROM users
+    WHERE id > :lo AND id <= :hi
+"""
 
-def _table_exists(connection, table_name: str) -> bool:
-    result = connection.execute(
-        text(
-            "SELECT 1 FROM information_schema.tables "
-            "WHERE table_schema = DATABASE() AND table_name = :t"
-        ),
-        {"t": table_name},
-    )
-    return result.scalar() is not None
+_PROFILE_RESTORE_SQL = """
+    UPDATE users u
+    INNER JOIN user_profiles p ON u.id = p.user_id
+    SET u.profile_picture_url = p.profile_picture_url,
+        u.dob = p.dob,
+        u.blood_group = p.blood_group,
+        u.address = p.address,
+        u.permanent_address = p.permanent_address,
+        u.father_name = p.father_name,
+        u.father_dob = p.father_dob,
+        u.mother_name = p.mother_name,
+        u.mother_dob = p.mother_dob,
+        u.spouse_name = p.spouse_name,
+        u.spouse_dob = p.spouse_dob,
+        u.children_names = p.children_names,
+        u.emergency_contact_name = p.emergency_contact_name,
+        u.emergency_contact_phone = p.emergency_contact_phone
+    WHERE u.id > :lo AND u.id <= :hi
+"""
 
 
-def _column_exists(connection, table_name: str, column_name: str) -> bool:
-    result = connection.execute(
-        text(
-            "SELECT 1 FROM information_schema.columns "
-            "WHERE table_schema = DATABASE() AND table_name = :t AND column_name = :c"
-        ),
-        {"t": table_name, "c": column_name},
-    )
-    return result.scalar() is not None
+def _run_in_id_batches(connection, sql: str) -> None:
+    """
+    Run a users.id-range statement in batches of _COPY_BATCH_SIZE rows, each committed on its own,
+    so large tables never hold one unbounded transaction (undo log, row locks).
+    Batch bounds are found by keyset on the primary key, so gaps in ids never produce empty or oversized batches.
+    """
+    last_id = 0
+    with op.get_context().autocommit_block():
+        while True:
+            hi = connection.execute(
+                text("SELECT id FROM users WHERE id > :last ORDER BY id LIMIT 1 OFFSET :skip"),
+                {"last": last_id, "skip": _COPY_BATCH_SIZE - 1},
+            ).scalar()
+            if hi is None:
+                # Fewer than a full batch left: run the tail and stop
+                hi = connection.execute(text("SELECT MAX(id) FROM users WHERE id > :last"), {"last": last_id}).scalar()
+                if hi is None:
+                    return
+            connection.execute(text(sql), {"lo": last_id, "hi": hi})
+            last_id = hi
 
 
 def upgrade() -> None:
     connection = op.get_bind()
+    snapshot = get_schema_snapshot(connection)
 
     # 1. Create user_profiles table only if it does not exist (idempotent)
-    if not _table_exists(connection, "user_profiles"):
+    if not snapshot.has_table("user_profiles"):
         op.create_table(
             "user_profiles",
             sa.Column("id", sa.Integer(), autoincrement=True, nullable=False),
@@ -68,31 +122,24 @@ def upgrade() -> None:
             sa.ForeignKeyConstraint(["user_id"], ["users.id"], ondelete="CASCADE", onupdate="CASCADE"),
             sa.UniqueConstraint("user_id", name="uq_user_profiles_user_id"),
         )
-        op.create_index("idx_user_profile_user_id", "user_profiles", ["user_id"], unique=False)
+        alter_table_online(connection, "user_profiles", ["ADD INDEX idx_user_profile_user_id (user_id)"])
+        snapshot.add_table(
+            "user_profiles", ["id", "user_id", *(col for col, _ in _PROFILE_COLUMNS), "created_at", "updated_at"]
+        )
+        snapshot.add_indexes("user_profiles", ["PRIMARY", "uq_user_profiles_user_id", "idx_user_profile_user_id"])
 
         # 2. Copy profile data from users to user_profiles (only if users still has the columns)
-        if _column_exists(connection, "users", "dob"):
-            op.execute("""
-                INSERT INTO user_profiles (user_id, profile_picture_url, dob, blood_group, address, permanent_address,
-                    father_name, father_dob, mother_name, mother_dob, spouse_name, spouse_dob, children_names,
-                    emergency_contact_name, emergency_contact_phone, created_at, updated_at)
-                SELECT id, profile_picture_url, dob, blood_group, address, permanent_address,
-                    father_name, father_dob, mother_name, mother_dob, spouse_name, spouse_dob, children_names,
-                    emergency_contact_name, emergency_contact_phone, created_at, updated_at
-                FROM users
-            """)
+        if snapshot.has_column("users", "dob"):
+            _run_in_id_batches(connection, _PROFILE_COPY_SQL)
 
         # 3. Drop profile columns from users (only if they exist)
-        for col in (
-            "profile_picture_url", "dob", "blood_group", "address", "permanent_address",
-            "father_name", "father_dob", "mother_name", "mother_dob", "spouse_name", "spouse_dob",
-            "children_names", "emergency_contact_name", "emergency_contact_phone",
-        ):
-            if _column_exists(connection, "users", col):
-                op.drop_column("users", col)
+        drop_cols = [col for col, _ in _PROFILE_COLUMNS if snapshot.has_column("users", col)]
+        if drop_cols:
+            alter_table_online(connection, "users", [f"DROP COLUMN `{col}`" for col in drop_cols])
+            snapshot.drop_columns("users", drop_cols)
 
     # 4. Create staff_roles table only if it does not exist (idempotent)
-    if not _table_exists(connection, "staff_roles"):
+    if not snapshot.has_table("staff_roles"):
         op.create_table(
             "staff_roles",
             sa.Column("id", sa.Integer(), autoincrement=True, nullable=False),
@@ -106,54 +153,38 @@ def upgrade() -> None:
             sa.ForeignKeyConstraint(["user_id"], ["users.id"], ondelete="CASCADE", onupdate="CASCADE"),
             sa.UniqueConstraint("user_id", "role_type", name="uq_staff_role_user_role"),
         )
-        op.create_index("idx_staff_role_user_id", "staff_roles", ["user_id"], unique=False)
-        op.create_index("idx_staff_role_role_type", "staff_roles", ["role_type"], unique=False)
-        op.create_index("idx_staff_role_is_active", "staff_roles", ["is_active"], unique=False)
+        alter_table_online(
+            connection,
+            "staff_roles",
+            [
+                "ADD INDEX idx_staff_role_user_id (user_id)",
+                "ADD INDEX idx_staff_role_role_type (role_type)",
+                "ADD INDEX idx_staff_role_is_active (is_active)",
+            ],
+        )
+        snapshot.add_table(
+            "staff_roles", ["id", "user_id", "role_type", "department", "is_active", "created_at", "updated_at"]
+        )
+        snapshot.add_indexes(
+            "staff_roles",
+            ["PRIMARY", "uq_staff_role_user_role", "idx_staff_role_user_id", "idx_staff_role_role_type", "idx_staff_role_is_active"],
+        )
 
 
 def downgrade() -> None:
-    # Drop staff_roles table
-    op.drop_index("idx_staff_role_is_active", table_name="staff_roles")
-    op.drop_index("idx_staff_role_role_type", table_name="staff_roles")
-    op.drop_index("idx_staff_role_user_id", table_name="staff_roles")
+    # Drop staff_roles table (its indexes go with it)
     op.drop_table("staff_roles")
 
     # Add profile columns back to users
-    op.add_column("users", sa.Column("profile_picture_url", sa.String(500), nullable=True))
-    op.add_column("users", sa.Column("dob", sa.Date(), nullable=True))
-    op.add_column("users", sa.Column("blood_group", sa.String(10), nullable=True))
-    op.add_column("users", sa.Column("address", sa.Text(), nullable=True))
-    op.add_column("users", sa.Column("permanent_address", sa.Text(), nullable=True))
-    op.add_column("users", sa.Column("father_name", sa.String(255), nullable=True))
-    op.add_column("users", sa.Column("father_dob", sa.Date(), nullable=True))
-    op.add_column("users", sa.Column("mother_name", sa.String(255), nullable=True))
-    op.add_column("users", sa.Column("mother_dob", sa.Date(), nullable=True))
-    op.add_column("users", sa.Column("spouse_name", sa.String(255), nullable=True))
-    op.add_column("users", sa.Column("spouse_dob", sa.Date(), nullable=True))
-    op.add_column("users", sa.Column("children_names", sa.Text(), nullable=True))
-    op.add_column("users", sa.Column("emergency_contact_name", sa.String(255), nullable=True))
-    op.add_column("users", sa.Column("emergency_contact_phone", sa.String(20), nullable=True))
+    connection = op.get_bind()
+    alter_table_online(
+        connection,
+        "users",
+        [f"ADD COLUMN `{col}` {col_type.compile(dialect=connection.dialect)} NULL" for col, col_type in _PROFILE_COLUMNS],
+    )
 
     # Copy data back from user_profiles to users
-    op.execute("""
-        UPDATE users u
-        INNER JOIN user_profiles p ON u.id = p.user_id
-        SET u.profile_picture_url = p.profile_picture_url,
-            u.dob = p.dob,
-            u.blood_group = p.blood_group,
-            u.address = p.address,
-            u.permanent_address = p.permanent_address,
-            u.father_name = p.father_name,
-            u.father_dob = p.father_dob,
-            u.mother_name = p.mother_name,
-            u.mother_dob = p.mother_dob,
-            u.spouse_name = p.spouse_name,
-            u.spouse_dob = p.spouse_dob,
-            u.children_names = p.children_names,
-            u.emergency_contact_name = p.emergency_contact_name,
-            u.emergency_contact_phone = p.emergency_contact_phone
-    """)
-
-    # Drop user_profiles table
-    op.drop_index("idx_user_profile_user_id", table_name="user_profiles")
+    _run_in_id_batches(connection, _PROFILE_RESTORE_SQL)
+
+    # Drop user_profiles table (its indexes go with it)
     op.drop_table("user_profiles")
@@ -5,8 +5,10 @@ Revises: 002_user_profiles_staff
 Create Date: Add is_deleted column to policies
 
 """
-from alembic import op  # type: ignore
+from alembic import context, op  # type: ignore
+from alembic.script import ScriptDirectory  # type: ignore
 import sqlalchemy as sa  # type: ignore
+from backend.utils.schema_snapshot import get_schema_snapshot
 
 
 revision = "003_policy_is_deleted"
@@ -14,12 +16,32 @@ down_revision = "002_user_profiles_staff"
 branch_labels = None
 depends_on = None
 
+# 004 also alters policies; when this run goes on to it, 004 adds is_deleted in the same ALTER TABLE.
+_POLICIES_SQUASH_REVISION = "004_drop_policy_doc_cols"
+
+
+def _upgrade_reaches(target_revision: str) -> bool:
+    """True if the current `alembic upgrade` target is at or beyond target_revision."""
+    try:
+        destination = context.get_revision_argument()
+        script = ScriptDirectory.from_config(context.config)
+        return any(s.revision == target_revision for s in script.walk_revisions(head=destination))
+    except Exception:
+        # Relative targets (+1) and similar: just apply this revision on its own
+        return False
+
 
 def upgrade() -> None:
+    snapshot = get_schema_snapshot(op.get_bind())
+    if snapshot.has_column("policies", "is_deleted"):
+        return
+    if _upgrade_reaches(_POLICIES_SQUASH_REVISION):
+        return
     op.add_column(
         "policies",
         sa.Column("is_deleted", sa.Boolean(), nullable=False, server_default=sa.false(), comment="Soft delete: hide from list but keep policy and documents"),
     )
+    snapshot.add_columns("policies", ["is_deleted"])
 
 
 def downgrade() -> None:
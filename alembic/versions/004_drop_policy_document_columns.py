@@ -7,6 +7,7 @@ Create Date: Drop deprecated document columns from policies table
 """
 from alembic import op  # type: ignore
 import sqlalchemy as sa  # type: ignore
+from backend.utils.schema_snapshot import alter_table_online, get_schema_snapshot
 
 
 revision = "004_drop_policy_doc_cols"
@@ -14,10 +15,28 @@ down_revision = "003_policy_is_deleted"
 branch_labels = None
 depends_on = None
 
+_DROP_COLUMNS = ("document_url", "document_name")
+
 
 def upgrade() -> None:
-    op.drop_column("policies", "document_url")
-    op.drop_column("policies", "document_name")
+    conn = op.get_bind()
+    snapshot = get_schema_snapshot(conn)
+    clauses = []
+    # 003 defers its ADD COLUMN to here when both revisions run together
+    add_is_deleted = not snapshot.has_column("policies", "is_deleted")
+    if add_is_deleted:
+        clauses.append(
+            "ADD COLUMN is_deleted BOOL NOT NULL DEFAULT false "
+            "COMMENT 'Soft delete: hide from list but keep policy and documents'"
+        )
+    drop_cols = [col for col in _DROP_COLUMNS if snapshot.has_column("policies", col)]
+    clauses.extend(f"DROP COLUMN {col}" for col in drop_cols)
+    if not clauses:
+        return
+    alter_table_online(conn, "policies", clauses)
+    if add_is_deleted:
+        snapshot.add_columns("policies", ["is_deleted"])
+    snapshot.drop_columns("policies", drop_cols)
 
 
 def downgrade() -> None:
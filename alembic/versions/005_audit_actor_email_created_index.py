@@ -0,0 +1,38 @@
+"""Replace idx_actor_email with a composite (actor_email, created_at DESC) index on audit_logs
+
+Revision ID: 005_audit_actor_created
+Revises: 004_drop_policy_doc_cols
+Create Date: Covering index for "actions by actor, newest first"
+
+"""
+from alembic import op  # type: ignore
+from backend.utils.schema_snapshot import alter_table_online, get_schema_snapshot
+
+
+revision = "005_audit_actor_created"
+down_revision = "004_drop_policy_doc_cols"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    conn = op.get_bind()
+    snapshot = get_schema_snapshot(conn)
+    clauses = []
+    if not snapshot.has_index("audit_logs", "idx_actor_email_created"):
+        # Full column (no prefix) so the index stays usable for ordering; utf8mb4 VARCHAR(255) fits
+        # the 3072-byte DYNAMIC row format limit
+        clauses.append("ADD INDEX idx_actor_email_created (actor_email, created_at DESC)")
+    # Leftmost prefix of the new index, so the single-column index is redundant
+    if snapshot.has_index("audit_logs", "idx_actor_email"):
+        clauses.append("DROP INDEX idx_actor_email")
+    if not clauses:
+        return
+    alter_table_online(conn, "audit_logs", clauses)
+    snapshot.add_indexes("audit_logs", ["idx_actor_email_created"])
+    snapshot.drop_indexes("audit_logs", ["idx_actor_email"])
+
+
+def downgrade() -> None:
+    op.create_index("idx_actor_email", "audit_logs", ["actor_email"])
+    op.drop_index("idx_actor_email_created", table_name="audit_logs")
@@ -0,0 +1,37 @@
+"""Drop single-column indexes that are leftmost prefixes of a composite index
+
+Revision ID: 006_drop_redundant_idx
+Revises: 005_audit_actor_created
+Create Date: audit_logs.idx_affected_entity_type, user_leave_balances.idx_user_id, user_balance_history.idx_user_id
+
+"""
+from alembic import op  # type: ignore
+from backend.utils.schema_snapshot import alter_table_online, get_schema_snapshot
+
+
+revision = "006_drop_redundant_idx"
+down_revision = "005_audit_actor_created"
+branch_labels = None
+depends_on = None
+
+# (table, redundant index, columns, composite index that already serves it)
+_REDUNDANT_INDEXES = [
+    ("audit_logs", "idx_affected_entity_type", ["affected_entity_type"], "idx_affected_entity"),
+    ("user_leave_balances", "idx_user_id", ["user_id"], "unique_user_leave_type"),
+    ("user_balance_history", "idx_user_id", ["user_id"], "idx_user_type"),
+]
+
+
+def upgrade() -> None:
+    conn = op.get_bind()
+    snapshot = get_schema_snapshot(conn)
+    for table, index, _cols, covering in _REDUNDANT_INDEXES:
+        # Only drop when the composite is there to take over (also keeps the user_id FK indexed)
+        if snapshot.has_index(table, index) and snapshot.has_index(table, covering):
+            alter_table_online(conn, table, [f"DROP INDEX {index}"])
+            snapshot.drop_indexes(table, [index])
+
+
+def downgrade() -> None:
+    for table, index, cols, _covering in _REDUNDANT_INDEXES:
+        op.create_index(index, table, cols)
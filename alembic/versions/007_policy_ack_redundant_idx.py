@@ -0,0 +1,40 @@
+"""Drop policy_acknowledgments single-column indexes covered by composites
+
+Revision ID: 007_policy_ack_redundant_idx
+Revises: 006_drop_redundant_idx
+Create Date: policy_acknowledgments.idx_user_id (-> idx_user_year), idx_year (-> idx_year_document)
+
+"""
+from alembic import op  # type: ignore
+from backend.utils.schema_snapshot import alter_table_online, get_schema_snapshot
+
+
+revision = "007_policy_ack_redundant_idx"
+down_revision = "006_drop_redundant_idx"
+branch_labels = None
+depends_on = None
+
+_TABLE = "policy_acknowledgments"
+# (redundant index, columns, composite index with the same leading column)
+_REDUNDANT_INDEXES = [
+    ("idx_user_id", ["user_id"], "idx_user_year"),
+    ("idx_year", ["year"], "idx_year_document"),
+]
+
+
+def upgrade() -> None:
+    conn = op.get_bind()
+    snapshot = get_schema_snapshot(conn)
+    # Only drop when the composite is there to take over (idx_user_year also keeps the user_id FK indexed)
+    drop = [
+        index for index, _cols, covering in _REDUNDANT_INDEXES
+        if snapshot.has_index(_TABLE, index) and snapshot.has_index(_TABLE, covering)
+    ]
+    if drop:
+        alter_table_online(conn, _TABLE, [f"DROP INDEX {index}" for index in drop])
+        snapshot.drop_indexes(_TABLE, drop)
+
+
+def downgrade() -> None:
+    for index, cols, _covering in _REDUNDANT_INDEXES:
+        op.create_index(index, _TABLE, cols)
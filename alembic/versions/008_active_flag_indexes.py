@@ -0,0 +1,53 @@
+"""Replace standalone is_active indexes with (is_active, <sort/filter column>) composites
+
+Revision ID: 008_active_flag_indexes
+Revises: 007_policy_ack_redundant_idx
+Create Date: users (is_active, full_name), policies (is_active, year); drop the rest
+
+"""
+from alembic import op  # type: ignore
+from backend.utils.schema_snapshot import alter_table_online, get_schema_snapshot
+
+
+revision = "008_active_flag_indexes"
+down_revision = "007_policy_ack_redundant_idx"
+branch_labels = None
+depends_on = None
+
+# MySQL has no partial indexes, so the boolean leads a composite whose second column the active-row
+# queries sort or range on. Flags no query filters on alone just lose their index.
+# (table, single-column is_active index, composite replacement or None, composite columns)
+_ACTIVE_INDEXES = [
+    ("users", "idx_is_active", "idx_active_full_name", ["is_active", "full_name"]),
+    ("policies", "idx_is_active", "idx_active_year", ["is_active", "year"]),
+    ("roles", "idx_active", None, []),
+    ("user_roles", "idx_active", None, []),
+    ("staff_roles", "idx_staff_role_is_active", None, []),
+]
+
+
+def upgrade() -> None:
+    conn = op.get_bind()
+    snapshot = get_schema_snapshot(conn)
+    for table, old_index, new_index, cols in _ACTIVE_INDEXES:
+        if not snapshot.has_table(table):
+            continue
+        clauses = []
+        # Add the composite in the same ALTER as the drop so active-row queries never lose their index
+        if new_index and not snapshot.has_index(table, new_index):
+            clauses.append(f"ADD INDEX {new_index} ({', '.join(cols)})")
+        if snapshot.has_index(table, old_index):
+            clauses.append(f"DROP INDEX {old_index}")
+        if clauses:
+            alter_table_online(conn, table, clauses)
+            if new_index:
+                snapshot.add_indexes(table, [new_index])
+            snapshot.drop_indexes(table, [old_index])
+
+
+def downgrade() -> None:
+    # Re-add the full single-column indexes before dropping the composites (old code may still rely on them)
+    for table, old_index, new_index, _cols in _ACTIVE_INDEXES:
+        op.create_index(old_index, table, ["is_active"])
+        if new_index:
+            op.drop_index(new_index, table_name=table)
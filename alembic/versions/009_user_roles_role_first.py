@@ -0,0 +1,45 @@
+"""user_roles: role-first composite index; drop single-column indexes it and the unique key cover
+
+Revision ID: 009_user_roles_role_first
+Revises: 008_active_flag_indexes
+Create Date: idx_role_id -> idx_role_user_active (role_id, user_id, is_active); drop idx_user_id
+
+"""
+from alembic import op  # type: ignore
+from backend.utils.schema_snapshot import alter_table_online, get_schema_snapshot
+
+
+revision = "009_user_roles_role_first"
+down_revision = "008_active_flag_indexes"
+branch_labels = None
+depends_on = None
+
+_TABLE = "user_roles"
+_NEW_INDEX = "idx_role_user_active"
+_NEW_COLUMNS = ["role_id", "user_id", "is_active"]
+# (dropped index, columns) - idx_role_id is covered by idx_role_user_active, idx_user_id by
+# unique_user_role_active (user_id, role_id, is_active); both still back their foreign keys
+_DROPPED = [("idx_role_id", ["role_id"]), ("idx_user_id", ["user_id"])]
+
+
+def upgrade() -> None:
+    conn = op.get_bind()
+    snapshot = get_schema_snapshot(conn)
+    if not snapshot.has_table(_TABLE):
+        return
+    clauses = []
+    # Added in the same ALTER as the drops so the role_id foreign key is never left without an index
+    if not snapshot.has_index(_TABLE, _NEW_INDEX):
+        clauses.append(f"ADD INDEX {_NEW_INDEX} ({', '.join(_NEW_COLUMNS)})")
+    dropped = [index for index, _cols in _DROPPED if snapshot.has_index(_TABLE, index)]
+    clauses.extend(f"DROP INDEX {index}" for index in dropped)
+    if clauses:
+        alter_table_online(conn, _TABLE, clauses)
+        snapshot.add_indexes(_TABLE, [_NEW_INDEX])
+        snapshot.drop_indexes(_TABLE, dropped)
+
+
+def downgrade() -> None:
+    for index, cols in _DROPPED:
+        op.create_index(index, _TABLE, cols)
+    op.drop_index(_NEW_INDEX, table_name=_TABLE)
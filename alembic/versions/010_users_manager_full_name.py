@@ -0,0 +1,39 @@
+"""users: (manager_id, full_name) composite replaces idx_manager_id
+
+Revision ID: 010_users_manager_full_name
+Revises: 009_user_roles_role_first
+Create Date: idx_manager_id -> idx_manager_full_name (manager_id, full_name)
+
+"""
+from alembic import op  # type: ignore
+from backend.utils.schema_snapshot import alter_table_online, get_schema_snapshot
+
+
+revision = "010_users_manager_full_name"
+down_revision = "009_user_roles_role_first"
+branch_labels = None
+depends_on = None
+
+_TABLE = "users"
+_OLD_INDEX = "idx_manager_id"
+_NEW_INDEX = "idx_manager_full_name"
+
+
+def upgrade() -> None:
+    conn = op.get_bind()
+    snapshot = get_schema_snapshot(conn)
+    clauses = []
+    # Same ALTER for add and drop so the manager_id foreign key always has an index
+    if not snapshot.has_index(_TABLE, _NEW_INDEX):
+        clauses.append(f"ADD INDEX {_NEW_INDEX} (manager_id, full_name)")
+    if snapshot.has_index(_TABLE, _OLD_INDEX):
+        clauses.append(f"DROP INDEX {_OLD_INDEX}")
+    if clauses:
+        alter_table_online(conn, _TABLE, clauses)
+        snapshot.add_indexes(_TABLE, [_NEW_INDEX])
+        snapshot.drop_indexes(_TABLE, [_OLD_INDEX])
+
+
+def downgrade() -> None:
+    op.create_index(_OLD_INDEX, _TABLE, ["manager_id"])
+    op.drop_index(_NEW_INDEX, table_name=_TABLE)
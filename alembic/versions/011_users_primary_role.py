@@ -0,0 +1,48 @@
+"""users.primary_role: denormalized active role name, backfilled from user_roles/roles
+
+Revision ID: 011_users_primary_role
+Revises: 010_users_manager_full_name
+Create Date: add users.primary_role VARCHAR(50) NULL; backfill with one UPDATE ... JOIN
+
+"""
+from alembic import op  # type: ignore
+import sqlalchemy as sa  # type: ignore
+from backend.utils.schema_snapshot import alter_table_online, get_schema_snapshot
+
+
+revision = "011_users_primary_role"
+down_revision = "010_users_manager_full_name"
+branch_labels = None
+depends_on = None
+
+# Same pick as the runtime sync in backend/models/role.py: most recently assigned active role
+_BACKFILL = """
+    UPDATE users u
+    JOIN (
+        SELECT ur.user_id, LOWER(r.name) AS role_name,
+            ROW_NUMBER() OVER (PARTITION BY ur.user_id ORDER BY ur.assigned_at DESC, ur.id DESC) AS rn
+        FROM user_roles ur
+        JOIN roles r ON r.id = ur.role_id
+        WHERE ur.is_active = 1
+    ) active ON active.user_id = u.id AND active.rn = 1
+    SET u.primary_role = active.role_name
+"""
+
+
+def upgrade() -> None:
+    conn = op.get_bind()
+    snapshot = get_schema_snapshot(conn)
+    if not snapshot.has_column("users", "primary_role"):
+        # Nullable column at the end: INSTANT metadata change on MySQL 8, no rebuild
+        alter_table_online(
+            conn,
+            "users",
+            ["ADD COLUMN primary_role VARCHAR(50) NULL COMMENT 'Active role name, maintained from user_roles'"],
+            instant=True,
+        )
+        snapshot.add_columns("users", ["primary_role"])
+    conn.execute(sa.text(_BACKFILL))
+
+
+def downgrade() -> None:
+    op.drop_column("users", "primary_role")
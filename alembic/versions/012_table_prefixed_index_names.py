@@ -0,0 +1,46 @@
+"""Rename generic per-table index names to idx_<table>_<column>
+
+Revision ID: 012_table_prefixed_index_names
+Revises: 011_users_primary_role
+Create Date: idx_user_id / idx_year / idx_policy_id on several tables -> table-prefixed names
+
+"""
+from alembic import op  # type: ignore
+import sqlalchemy as sa  # type: ignore
+from backend.utils.schema_snapshot import get_schema_snapshot
+
+
+revision = "012_table_prefixed_index_names"
+down_revision = "011_users_primary_role"
+branch_labels = None
+depends_on = None
+
+# (table, old name, new name)
+_RENAMES = [
+    ("audit_logs", "idx_user_id", "idx_audit_logs_user_id"),
+    ("leave_comments", "idx_user_id", "idx_leave_comments_user_id"),
+    ("notifications", "idx_user_id", "idx_notifications_user_id"),
+    ("user_documents", "idx_user_id", "idx_user_documents_user_id"),
+    ("holidays", "idx_year", "idx_holidays_year"),
+    ("policies", "idx_year", "idx_policies_year"),
+    ("policy_documents", "idx_policy_id", "idx_policy_documents_policy_id"),
+]
+
+
+def _rename_indexes(renames: list[tuple[str, str, str]]) -> None:
+    conn = op.get_bind()
+    snapshot = get_schema_snapshot(conn)
+    for table, old, new in renames:
+        if snapshot.has_index(table, old) and not snapshot.has_index(table, new):
+            # RENAME INDEX is a metadata-only change on MySQL 5.7+: no rebuild, no write lock
+            conn.execute(sa.text(f"ALTER TABLE {table} RENAME INDEX {old} TO {new}"))
+            snapshot.drop_indexes(table, [old])
+            snapshot.add_indexes(table, [new])
+
+
+def upgrade() -> None:
+    _rename_indexes(_RENAMES)
+
+
+def downgrade() -> None:
+    _rename_indexes([(table, new, old) for table, old, new in _RENAMES])
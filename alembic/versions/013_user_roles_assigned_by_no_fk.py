@@ -0,0 +1,49 @@
+"""user_roles.assigned_by: plain audit column, no foreign key
+
+Revision ID: 013_user_roles_assigned_by_no_fk
+Revises: 012_table_prefixed_index_names
+Create Date: drop the assigned_by -> users.id FK and the assigned_by index InnoDB created for it
+
+"""
+from alembic import op  # type: ignore
+import sqlalchemy as sa  # type: ignore
+from backend.utils.schema_snapshot import alter_table_online, get_schema_snapshot, single_column_indexes
+
+
+revision = "013_user_roles_assigned_by_no_fk"
+down_revision = "012_table_prefixed_index_names"
+branch_labels = None
+depends_on = None
+
+_FK_NAME_DOWNGRADE = "fk_user_roles_assigned_by"
+_INDEX_NAME_DOWNGRADE = "assigned_by"
+
+
+def upgrade() -> None:
+    conn = op.get_bind()
+    snapshot = get_schema_snapshot(conn)
+    # The FK was created unnamed by create_all / 001 (user_roles_ibfk_N), so look its name up
+    fk_names = conn.execute(
+        sa.text(
+            "SELECT CONSTRAINT_NAME FROM information_schema.KEY_COLUMN_USAGE "
+            "WHERE TABLE_SCHEMA = DATABASE() AND TABLE_NAME = 'user_roles' "
+            "AND COLUMN_NAME = 'assigned_by' AND REFERENCED_TABLE_NAME IS NOT NULL"
+        )
+    ).scalars().all()
+    # The index InnoDB added for the unnamed FK is named after the column (assigned_by), not the constraint,
+    # so find it by its columns; dropped in the same ALTER as the FK
+    dropped_indexes = single_column_indexes(conn, "user_roles", "assigned_by")
+    clauses = [f"DROP FOREIGN KEY `{name}`" for name in fk_names]
+    clauses += [f"DROP INDEX `{name}`" for name in dropped_indexes]
+    if not clauses:
+        return
+    alter_table_online(conn, "user_roles", clauses)
+    snapshot.drop_indexes("user_roles", dropped_indexes)
+
+
+def downgrade() -> None:
+    # Restore the index under the name MySQL gave it, then the FK on top of it
+    op.create_index(_INDEX_NAME_DOWNGRADE, "user_roles", ["assigned_by"])
+    op.create_foreign_key(
+        _FK_NAME_DOWNGRADE, "user_roles", "users", ["assigned_by"], ["id"], ondelete="SET NULL", onupdate="CASCADE"
+    )
@@ -0,0 +1,32 @@
+"""users: unique index on password_reset_token
+
+Revision ID: 014_users_reset_token_idx
+Revises: 013_user_roles_assigned_by_no_fk
+Create Date: add idx_password_reset_token so reset-password is an index lookup, not a scan
+
+"""
+from alembic import op  # type: ignore
+from backend.utils.schema_snapshot import alter_table_online, get_schema_snapshot
+
+
+revision = "014_users_reset_token_idx"
+down_revision = "013_user_roles_assigned_by_no_fk"
+branch_labels = None
+depends_on = None
+
+_TABLE = "users"
+_INDEX = "idx_password_reset_token"
+
+
+def upgrade() -> None:
+    conn = op.get_bind()
+    snapshot = get_schema_snapshot(conn)
+    if snapshot.has_index(_TABLE, _INDEX):
+        return
+    # Secondary index build is online in InnoDB
+    alter_table_online(conn, _TABLE, [f"ADD UNIQUE INDEX {_INDEX} (password_reset_token)"])
+    snapshot.add_indexes(_TABLE, [_INDEX])
+
+
+def downgrade() -> None:
+    op.drop_index(_INDEX, table_name=_TABLE)
@@ -0,0 +1,34 @@
+"""holidays: drop idx_date, a duplicate of the unique key on date
+
+Revision ID: 015_holidays_date_unique_only
+Revises: 014_users_reset_token_idx
+Create Date: holidays.date is served by its UNIQUE key (named `date`); idx_date indexes the same column again
+
+"""
+from alembic import op  # type: ignore
+from backend.utils.schema_snapshot import alter_table_online, get_schema_snapshot
+
+
+revision = "015_holidays_date_unique_only"
+down_revision = "014_users_reset_token_idx"
+branch_labels = None
+depends_on = None
+
+_TABLE = "holidays"
+_INDEX = "idx_date"
+# MySQL names the index of an unnamed column-level UNIQUE after the column
+_UNIQUE_INDEX = "date"
+
+
+def upgrade() -> None:
+    conn = op.get_bind()
+    snapshot = get_schema_snapshot(conn)
+    # Only drop when the unique key is there to serve date lookups and ORDER BY date
+    if not (snapshot.has_index(_TABLE, _INDEX) and snapshot.has_index(_TABLE, _UNIQUE_INDEX)):
+        return
+    alter_table_online(conn, _TABLE, [f"DROP INDEX {_INDEX}"])
+    snapshot.drop_indexes(_TABLE, [_INDEX])
+
+
+def downgrade() -> None:
+    op.create_index(_INDEX, _TABLE, ["date"])
@@ -0,0 +1,30 @@
+"""user_roles: drop the assigned_by index left behind by 013
+
+Revision ID: 016_user_roles_assigned_by_index
+Revises: 015_holidays_date_unique_only
+Create Date: 013 originally looked the FK's index up by constraint name and kept `assigned_by`; drop it here
+
+"""
+from alembic import op  # type: ignore
+from backend.utils.schema_snapshot import alter_table_online, get_schema_snapshot, single_column_indexes
+
+
+revision = "016_user_roles_assigned_by_index"
+down_revision = "015_holidays_date_unique_only"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    conn = op.get_bind()
+    snapshot = get_schema_snapshot(conn)
+    dropped_indexes = single_column_indexes(conn, "user_roles", "assigned_by")
+    if not dropped_indexes:
+        return
+    alter_table_online(conn, "user_roles", [f"DROP INDEX `{name}`" for name in dropped_indexes])
+    snapshot.drop_indexes("user_roles", dropped_indexes)
+
+
+def downgrade() -> None:
+    # Nothing to restore: at 015 the model has no assigned_by index either, and 013's downgrade re-adds it
+    pass
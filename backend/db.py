@@ -1,22 +1,21 @@
 """
 Database configuration and session management
-Combines SQLAlchemy ORM (primary) with legacy aiomysql support (for migration)
+SQLAlchemy ORM on a single async engine pool; the legacy raw-query helper runs on the same pool.
 """
 import os
-from contextlib import asynccontextmanager
-from dotenv import load_dotenv
-from typing import Optional, Dict, Any, List, Tuple
+import asyncio
+from backend.utils.env import load_env
+from typing import Optional, Dict, Any, List
 import logging
+import orjson  # type: ignore
 
 # SQLAlchemy imports
-from sqlalchemy import text  # type: ignore
+from sqlalchemy import text, insert, event  # type: ignore
+from sqlalchemy.exc import DBAPIError  # type: ignore
 from sqlalchemy.ext.asyncio import create_async_engine, AsyncSession, async_sessionmaker  # type: ignore
 from sqlalchemy.orm import declarative_base  # type: ignore
 
-# Legacy aiomysql imports (for backward compatibility)
-import aiomysql  # type: ignore
-
-load_dotenv()
+load_env()
 
 # Database Configuration
 MYSQL_HOST = os.getenv("MYSQL_HOST", "localhost")
@@ -25,22 +24,71 @@ MYSQL_USER = os.getenv("MYSQL_USER", "root")
 MYSQL_PASSWORD = os.getenv("MYSQL_PASSWORD", "adminadmin")
 MYSQL_DATABASE = os.getenv("MYSQL_DATABASE", "leave_management_db")
 MYSQL_CHARSET = os.getenv("MYSQL_CHARSET", "utf8mb4")
+# Async driver: asyncmy (Cython-compiled protocol parser) by default; set to "aiomysql" to fall back
+MYSQL_ASYNC_DRIVER = os.getenv("MYSQL_ASYNC_DRIVER", "asyncmy")
+# Pool sizing per process. MySQL max_connections should be at least
+# workers * (DB_POOL_SIZE + DB_MAX_OVERFLOW) plus headroom for migrations/admin sessions.
+DB_POOL_SIZE = int(os.getenv("DB_POOL_SIZE", 25))
+DB_MAX_OVERFLOW = int(os.getenv("DB_MAX_OVERFLOW", 25))
+# Dev/CI guard: list queries built with load_*_full() raise on any relationship they did not eager-load
+# (instead of silently issuing one lazy query per row)
+RAISELOAD_GUARD = os.getenv("SQLALCHEMY_RAISELOAD", "").lower() in ("1", "true", "yes")
+# Connections opened at startup so the first requests do not pay the connect/auth handshake
+POOL_WARM_SIZE = int(os.getenv("POOL_WARM_SIZE", 5))
 
 logger = logging.getLogger(__name__)
 
+# alembic.ini lives at the project root, one level above backend/
+ALEMBIC_INI_PATH = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "alembic.ini")
+
 # SQLAlchemy Setup (Primary - Recommended)
 # SQLAlchemy database URL
-DATABASE_URL = f"mysql+aiomysql://{MYSQL_USER}:{MYSQL_PASSWORD}@{MYSQL_HOST}:{MYSQL_PORT}/{MYSQL_DATABASE}?charset=utf8mb4"
+DATABASE_URL = f"mysql+{MYSQL_ASYNC_DRIVER}://{MYSQL_USER}:{MYSQL_PASSWORD}@{MYSQL_HOST}:{MYSQL_PORT}/{MYSQL_DATABASE}?charset=utf8mb4"
+
+def _json_default(obj: Any) -> Any:
+    """Fallback for values orjson does not encode natively (Decimal, enum-like objects, ...)."""
+    if hasattr(obj, "value"):
+        return obj.value
+    return str(obj)
+
+
+def json_dumps(value: Any) -> str:
+    """Serializer for JSON columns: orjson (datetime/date/enum/UUID natively, non-str keys as str)."""
+    return orjson.dumps(value, default=_json_default, option=orjson.OPT_NON_STR_KEYS).decode()
+
 
 # Create async engine
+# No pre-ping (it costs a SELECT 1 round-trip per checkout); connections are recycled
+# before MySQL's wait_timeout instead, and disconnects are handled in handle_error below.
+# LIFO checkout reuses the most recently returned connections, so idle extras age out via recycle.
 engine = create_async_engine(
     DATABASE_URL,
     echo=False,  # Set to True for SQL query logging
-    pool_pre_ping=True,
-    pool_size=10,
-    max_overflow=20,
+    pool_pre_ping=False,
+    pool_recycle=1800,
+    pool_size=DB_POOL_SIZE,
+    max_overflow=DB_MAX_OVERFLOW,
+    pool_use_lifo=True,
+    json_serializer=json_dumps,
+    json_deserializer=orjson.loads,
+    # Sessions run in UTC so CURRENT_TIMESTAMP server defaults agree with the models' datetime.utcnow defaults
+    connect_args={"init_command": "SET time_zone = '+00:00'"},
 )
 
+
+@event.listens_for(engine.sync_engine, "handle_error")
+def _invalidate_on_disconnect(context):
+    """On a dropped connection, discard the pool so the retried request gets a fresh connection."""
+    if context.is_disconnect:
+        context.invalidate_pool_on_disconnect = True
+        logger.warning("Database connection lost; invalidating pool: %s", context.original_exception)
+
+# Under a pre-forking server (gunicorn --preload, uvicorn workers forked after import) each worker must
+# open its own connections on its own event loop: drop inherited pool entries without closing the
+# parent's sockets. The engine and session factory themselves hold no loop state until first connect.
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=lambda: engine.sync_engine.dispose(close=False))
+
 # Create async session factory
 AsyncSessionLocal = async_sessionmaker(
     engine,
@@ -50,7 +98,10 @@ AsyncSessionLocal = async_sessionmaker(
     autoflush=False,
 )
 
-# Base class for SQLAlchemy models
+# Base class for SQLAlchemy models.
+# Timestamp columns keep default=datetime.utcnow next to their server_default: a server-only default leaves the
+# attribute expired after INSERT (MySQL has no RETURNING), and touching it on an AsyncSession would lazy-load.
+# Tables written only through Core inserts (audit_logs) use the server default alone.
 Base = declarative_base()
 
 
@@ -59,6 +110,8 @@ async def get_db() -> AsyncSession:
     """
     Get SQLAlchemy database session (FastAPI dependency).
     Use this in your route handlers.
+    The session is not committed on exit: write handlers must call `await db.commit()` themselves,
+    so read-only requests skip the COMMIT round-trip (close() just rolls back the read transaction).
     
     Example:
         @router.get("/users")
@@ -69,7 +122,6 @@ async def get_db() -> AsyncSession:
     async with AsyncSessionLocal() as session:
         try:
             yield session
-            await session.commit()
         except Exception:
             await session.rollback()
             raise
@@ -77,104 +129,113 @@ async def get_db() -> AsyncSession:
             await session.close()
 
 
+async def bulk_insert(table, rows: List[Dict[str, Any]], page_size: int = 1000) -> int:
+    """
+    Insert many rows through the SQLAlchemy engine in one transaction.
+    Each page of rows is sent as a single executemany (multi-row INSERT) instead of one INSERT per row.
+    `table` may be an ORM model or a Table. Returns the number of rows inserted.
+    """
+    if not rows:
+        return 0
+    async with engine.begin() as conn:
+        for start in range(0, len(rows), page_size):
+            await conn.execute(insert(table), rows[start:start + page_size])
+    return len(rows)
+
+
 async def ensure_database_exists():
     """
     Create the application database if it does not exist.
     Connects to MySQL server (using 'mysql' system db) and runs CREATE DATABASE IF NOT EXISTS.
     Call this before init_db() when the database might not exist yet (e.g. first-time bootstrap).
     """
-    # Connect without our app database so we can create it (use 'mysql' system database)
-    url_no_db = f"mysql+aiomysql://{MYSQL_USER}:{MYSQL_PASSWORD}@{MYSQL_HOST}:{MYSQL_PORT}/mysql?charset={MYSQL_CHARSET}"
-    temp_engine = create_async_engine(url_no_db, pool_pre_ping=True)
-    escaped = MYSQL_DATABASE.replace("`", "``")
-    async with temp_engine.begin() as conn:
-        await conn.execute(
-            text("CREATE DATABASE IF NOT EXISTS `{:s}` CHARACTER SET utf8mb4 COLLATE utf8mb4_unicode_ci".format(escaped))
+    # One bare driver connection to the 'mysql' system database: no engine/pool to build and dispose
+    if MYSQL_ASYNC_DRIVER == "aiomysql":
+        import aiomysql  # type: ignore
+
+        conn = await aiomysql.connect(
+            host=MYSQL_HOST, port=MYSQL_PORT, user=MYSQL_USER, password=MYSQL_PASSWORD,
+            db="mysql", charset=MYSQL_CHARSET,
+        )
+    else:
+        import asyncmy  # type: ignore
+
+        conn = await asyncmy.connect(
+            host=MYSQL_HOST, port=MYSQL_PORT, user=MYSQL_USER, password=MYSQL_PASSWORD,
+            database="mysql", charset=MYSQL_CHARSET,
         )
-    await temp_engine.dispose()
+    escaped = MYSQL_DATABASE.replace("`", "``")
+    try:
+        async with conn.cursor() as cur:
+            await cur.execute(
+                "CREATE DATABASE IF NOT EXISTS `{:s}` CHARACTER SET utf8mb4 COLLATE utf8mb4_unicode_ci".format(escaped)
+            )
+    finally:
+        conn.close()
     logger.info(f"Database {MYSQL_DATABASE} ensured (created if missing).")
 
 
+def _alembic_head() -> Optional[str]:
+    """Head revision of the Alembic scripts, or None if it cannot be determined."""
+    try:
+        from alembic.config import Config  # type: ignore
+        from alembic.script import ScriptDirectory  # type: ignore
+
+        return ScriptDirectory.from_config(Config(ALEMBIC_INI_PATH)).get_current_head()
+    except Exception as e:
+        logger.warning(f"Could not determine Alembic head revision: {e}")
+        return None
+
+
 async def init_db():
     """
     Initialize database - create all tables using SQLAlchemy models.
     This is called on application startup.
+    Skipped when alembic_version is already at head: the schema is current and create_all would
+    only spend one reflection round-trip per model to find that out.
     """
+    head = _alembic_head()
     async with engine.begin() as conn:
-        await conn.run_sync(Base.metadata.create_all)
+        current = None
+        if head is not None:
+            try:
+                current = (await conn.execute(text("SELECT version_num FROM alembic_version"))).scalar()
+            except DBAPIError:
+                # No alembic_version table yet (fresh database)
+                current = None
+        if head is not None and current == head:
+            logger.info(f"Database schema at Alembic head {head}; skipping create_all")
+        else:
+            await conn.run_sync(Base.metadata.create_all)
     logger.info(f"Database initialized: {MYSQL_DATABASE}")
 
 
+async def warm_connection_pool(n: int = POOL_WARM_SIZE) -> None:
+    """
+    Open n pool connections concurrently and return them to the pool.
+    Called on startup after init_db(); connections held open together so the pool keeps n of them.
+    """
+    async def _one():
+        async with engine.connect() as conn:
+            await conn.execute(text("SELECT 1"))
+
+    if n <= 0:
+        return
+    await asyncio.gather(*[_one() for _ in range(n)])
+    logger.info(f"Connection pool warmed with {n} connections")
+
+
 async def close_db():
     """Close database connections"""
     await engine.dispose()
     logger.info("Database connections closed")
 
 
-
-# Legacy connection pool
-_pool: Optional[aiomysql.Pool] = None
-
-
-async def get_pool() -> aiomysql.Pool:
-    """Get or create MySQL connection pool (legacy - use SQLAlchemy instead)."""
-    global _pool
-    if _pool is None:
-        try:
-            _pool = await aiomysql.create_pool(
-                host=MYSQL_HOST,
-                port=MYSQL_PORT,
-                user=MYSQL_USER,
-                password=MYSQL_PASSWORD,
-                db=MYSQL_DATABASE,
-                charset=MYSQL_CHARSET,
-                autocommit=True,
-                minsize=1,
-                maxsize=10,
-                cursorclass=aiomysql.DictCursor
-            )
-            logger.info(f"Legacy MySQL connection pool created for {MYSQL_DATABASE}")
-        except Exception as e:
-            logger.error(f"Failed to create MySQL connection pool: {str(e)}")
-            raise
-    return _pool
-
-
-async def close_pool():
-    """Close MySQL connection pool (legacy)."""
-    global _pool
-    if _pool:
-        _pool.close()
-        await _pool.wait_closed()
-        _pool = None
-        logger.info("Legacy MySQL connection pool closed")
-
-
-@asynccontextmanager
-async def get_connection():
-    """Get a database connection from the pool (legacy - use get_db() instead)."""
-    pool = await get_pool()
-    async with pool.acquire() as conn:
-        yield conn
-
-
-@asynccontextmanager
-async def get_cursor():
-    """Get a database cursor from the pool (legacy - use get_db() instead)."""
-    try:
-        pool = await get_pool()
-        async with pool.acquire() as conn:
-            async with conn.cursor() as cursor:
-                yield cursor
-    except Exception as e:
-        logger.error(f"Failed to get database cursor: {str(e)}")
-        raise
-
 async def execute_query(query: str, params: Optional[tuple] = None) -> List[Dict[str, Any]]:
     """
-    Execute a SELECT query and return results as list of dictionaries (legacy).
-    Use SQLAlchemy select() instead.
+    Execute a raw SELECT (DBAPI %s placeholders) and return rows as dictionaries (legacy).
+    Runs on the SQLAlchemy engine's pool. Use SQLAlchemy select() instead.
     """
-    async with get_cursor() as cursor:
-        await cursor.execute(query, params)
-        return await cursor.fetchall()
+    async with engine.connect() as conn:
+        result = await conn.exec_driver_sql(query, params or ())
+        return [dict(row) for row in result.mappings().all()]
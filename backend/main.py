@@ -1,61 +1,77 @@
-import time
 import logging
-from fastapi import FastAPI, Request
-from fastapi.staticfiles import StaticFiles
+import sys
+from fastapi import FastAPI
+from fastapi.responses import ORJSONResponse
 from contextlib import asynccontextmanager
-from dotenv import load_dotenv
+from backend.utils.env import load_env
 import os
-from fastapi.middleware.cors import CORSMiddleware
+from starlette.middleware.gzip import GZipMiddleware
+from sqlalchemy.exc import DBAPIError  # type: ignore
 
 # Load env vars
-load_dotenv()
+load_env()
+
+# uvloop (libuv-based event loop) when available; uvicorn's default loop="auto" also picks it up
+try:
+    import asyncio
+    import uvloop  # type: ignore
+
+    asyncio.set_event_loop_policy(uvloop.EventLoopPolicy())
+except ImportError:
+    pass
 
 from backend.routes import auth, holidays, leaves, users, policies, manager
 from backend.services.scheduler import start_scheduler, shutdown_scheduler
-from backend.db import init_db, close_db
-from backend.utils.logging_config import setup_logging
+from backend.services.audit import start_audit_writer, stop_audit_writer
+from backend.db import init_db, close_db, warm_connection_pool
+from backend.utils.logging_config import setup_logging, stop_logging
+from backend.middleware.request_logging import RequestLoggingMiddleware
+from backend.middleware.fast_cors import FastCORSMiddleware
+from backend.middleware.etag import ETagMiddleware
+from backend.middleware.static_cache_control import StaticCacheControlMiddleware
+from backend.static_cache import CachedStatic
 
 # Configure logging (file + console) on import
 LOG_LEVEL = os.getenv("LOG_LEVEL", "INFO")
-setup_logging(level=LOG_LEVEL)
+LOG_FORMAT = os.getenv("LOG_FORMAT", "text")  # "text" or "json"
+setup_logging(level=LOG_LEVEL, json_format=LOG_FORMAT.lower() == "json")
 logger = logging.getLogger(__name__)
 
+# MySQL "Unknown database"
+ER_BAD_DB_ERROR = 1049
+
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
-    # Startup: init_db() creates tables; if DB does not exist yet, skip (bootstrap will create it)
+    # Startup: init_db() creates tables and the pool is pre-connected; if DB does not exist yet, skip (bootstrap will create it)
     try:
         await init_db()
-    except Exception as e:
-        err_msg = str(e).lower()
-        if "unknown database" in err_msg or "1049" in err_msg or "does not exist" in err_msg:
+        await warm_connection_pool()
+    except DBAPIError as e:
+        # MySQL error code from the driver exception (asyncmy/aiomysql/pymysql all use args[0])
+        if (getattr(e.orig, "args", None) or (None,))[0] == ER_BAD_DB_ERROR:
             logger.warning("Database not found; run POST /admin/bootstrap to create DB and seed.")
         else:
             raise
     start_scheduler()
+    start_audit_writer()
     logger.info("Application started")
     yield
     # Shutdown
     shutdown_scheduler()
+    await stop_audit_writer()  # Queued audit entries need the engine, so before close_db()
     await close_db()  # Close database connections
     logger.info("Application shutdown")
+    stop_logging()
+
+# One app per process: this file loaded a second time under another module name (e.g. "main" next to
+# "backend.main") would build a second app with its own middleware stack and scheduler.
+for _name in ("backend.main", "main"):
+    if _name != __name__ and getattr(sys.modules.get(_name), "app", None) is not None:
+        raise RuntimeError(f"{__name__} imported while {_name} already created the app; use backend.main:app only")
 
-app = FastAPI(title="Leave Management System", lifespan=lifespan)
-
-@app.middleware("http")
-async def log_requests(request: Request, call_next):
-    """Log every HTTP request: method, path, status, duration."""
-    start = time.perf_counter()
-    response = await call_next(request)
-    duration_ms = (time.perf_counter() - start) * 1000
-    logger.info(
-        "%s %s %s %.2fms",
-        request.method,
-        request.url.path,
-        response.status_code,
-        duration_ms,
-    )
-    return response
+# orjson for every JSON response; FastAPI runs jsonable_encoder first, so Decimal/datetime/enum are already plain
+app = FastAPI(title="Leave Management System", lifespan=lifespan, default_response_class=ORJSONResponse)
 
 # CORS Configuration
 origins = [
@@ -63,13 +79,19 @@ origins = [
     "http://127.0.0.1:3000",
 ]
 
-app.add_middleware(
-    CORSMiddleware,
-    allow_origins=origins,
-    allow_credentials=True,
-    allow_methods=["*"],
-    allow_headers=["*"],
-)
+app.add_middleware(FastCORSMiddleware, origins=origins)
+
+# Far-future private Cache-Control on /static (upload names are uuid4-based, never reused)
+app.add_middleware(StaticCacheControlMiddleware)
+
+# ETag + 304 for small GET responses; registered before GZip so it hashes the uncompressed body
+app.add_middleware(ETagMiddleware)
+
+# Compress JSON list responses; added after CORS so it wraps (and compresses) the final body
+app.add_middleware(GZipMiddleware, minimum_size=1024, compresslevel=5)
+
+# Added last, so outermost: logs the status the client gets (e.g. ETag's 304) and times gzip too
+app.add_middleware(RequestLoggingMiddleware)
 
 # Include Routers
 @app.get("/")
@@ -85,6 +107,6 @@ app.include_router(holidays.calendar_router)
 app.include_router(policies.router)
 
 # Mount static files
-app.mount("/static", StaticFiles(directory="static"), name="static")
+app.mount("/static", CachedStatic(directory="static"), name="static")
 
 
@@ -0,0 +1,99 @@
+"""
+ETag middleware (pure ASGI).
+Adds an ETag to small 200 responses of GET requests and answers If-None-Match hits with an empty 304,
+so unchanged JSON (holidays, policies, ...) is not re-sent. Responses that already carry an ETag
+(StaticFiles sets one from mtime+size and handles 304 itself) are passed through untouched.
+"""
+import hashlib
+
+# Larger responses are streamed through without an ETag rather than buffered
+DEFAULT_MAX_BODY_SIZE = 64 * 1024
+
+# Headers that describe a body; a 304 has none
+_BODY_HEADERS = (b"content-length", b"content-type")
+
+
+def etag_matches(if_none_match: bytes, etag: bytes) -> bool:
+    """If-None-Match comparison (weak): "*" or any listed tag equal to etag, ignoring W/ prefixes."""
+    if if_none_match.strip() == b"*":
+        return True
+    bare = etag[2:] if etag.startswith(b"W/") else etag
+    for tag in if_none_match.split(b","):
+        tag = tag.strip()
+        if tag.startswith(b"W/"):
+            tag = tag[2:]
+        if tag == bare:
+            return True
+    return False
+
+
+class ETagMiddleware:
+    """Buffer GET 200 responses up to max_body_size, tag them with a body hash, and short-circuit to 304."""
+
+    def __init__(self, app, max_body_size: int = DEFAULT_MAX_BODY_SIZE):
+        self.app = app
+        self.max_body_size = max_body_size
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or scope["method"] != "GET":
+            await self.app(scope, receive, send)
+            return
+
+        if_none_match = None
+        for name, value in scope["headers"]:
+            if name == b"if-none-match":
+                if_none_match = value
+                break
+
+        start_message = None
+        chunks = []
+        size = 0
+        passthrough = False
+
+        async def send_wrapper(message):
+            nonlocal start_message, size, passthrough
+            if passthrough:
+                await send(message)
+                return
+
+            if message["type"] == "http.response.start":
+                headers = message.get("headers", [])
+                if message["status"] != 200 or any(name == b"etag" for name, _ in headers):
+                    passthrough = True
+                    await send(message)
+                else:
+                    start_message = message
+                return
+
+            if message["type"] != "http.response.body":
+                await send(message)
+                return
+
+            body = message.get("body", b"")
+            more_body = message.get("more_body", False)
+            chunks.append(body)
+            size += len(body)
+            if size > self.max_body_size:
+                # Too large to buffer: flush what we have and stream the rest as-is
+                passthrough = True
+                await send(start_message)
+                await send({"type": "http.response.body", "body": b"".join(chunks), "more_body": more_body})
+                return
+            if more_body:
+                return
+
+            full_body = b"".join(chunks)
+            # Weak: GZip may re-encode the body on the way out
+            etag = b'W/"' + hashlib.blake2b(full_body, digest_size=8).hexdigest().encode("ascii") + b'"'
+            if if_none_match is not None and etag_matches(if_none_match, etag):
+                headers = [(k, v) for k, v in start_message.get("headers", []) if k not in _BODY_HEADERS]
+                headers.append((b"etag", etag))
+                await send({"type": "http.response.start", "status": 304, "headers": headers})
+                await send({"type": "http.response.body", "body": b""})
+                return
+
+            start_message["headers"] = list(start_message.get("headers", [])) + [(b"etag", etag)]
+            await send(start_message)
+            await send({"type": "http.response.body", "body": full_body})
+
+        await self.app(scope, receive, send_wrapper)
@@ -0,0 +1,74 @@
+"""
+CORS middleware for a fixed list of allowed origins.
+Same response headers as Starlette's CORSMiddleware with allow_credentials=True and "*" methods/headers,
+but they are encoded once at startup and set on the raw ASGI header list, instead of going through
+MutableHeaders (str -> bytes, dict update) on every response.
+"""
+from typing import List, Sequence, Tuple
+
+from starlette.datastructures import Headers  # type: ignore
+from starlette.middleware.cors import CORSMiddleware  # type: ignore
+from starlette.types import ASGIApp, Message, Send  # type: ignore
+
+
+def _set_header(headers: List[Tuple[bytes, bytes]], name: bytes, value: bytes) -> None:
+    """Replace every `name` header with one (name, value), in place of the first (MutableHeaders.__setitem__)."""
+    found = [i for i, (key, _) in enumerate(headers) if key == name]
+    if not found:
+        headers.append((name, value))
+        return
+    headers[found[0]] = (name, value)
+    for i in reversed(found[1:]):
+        del headers[i]
+
+
+class FastCORSMiddleware(CORSMiddleware):
+    """CORSMiddleware for explicit origins (no "*"), with precomputed header tuples on the simple-response path."""
+
+    def __init__(
+        self,
+        app: ASGIApp,
+        origins: Sequence[str],
+        allow_methods: Sequence[str] = ("*",),
+        allow_headers: Sequence[str] = ("*",),
+        allow_credentials: bool = True,
+    ) -> None:
+        super().__init__(
+            app,
+            allow_origins=origins,
+            allow_methods=allow_methods,
+            allow_headers=allow_headers,
+            allow_credentials=allow_credentials,
+        )
+        self._allow_origins = frozenset(origins)
+        self._simple_headers = [
+            (name.lower().encode("latin-1"), value.encode("latin-1"))
+            for name, value in self.simple_headers.items()
+        ]
+
+    def is_allowed_origin(self, origin: str) -> bool:
+        return origin in self._allow_origins
+
+    async def send(self, message: Message, send: Send, request_headers: Headers) -> None:
+        if message["type"] != "http.response.start":
+            await send(message)
+            return
+
+        headers = message.setdefault("headers", [])
+        if not isinstance(headers, list):
+            headers = message["headers"] = list(headers)
+
+        origin = request_headers.get("origin")
+        if origin is not None:
+            for name, value in self._simple_headers:
+                _set_header(headers, name, value)
+            if origin in self._allow_origins:
+                _set_header(headers, b"access-control-allow-origin", origin.encode("latin-1"))
+
+        # Every response varies on Origin (allowed, disallowed or absent), so a shared cache never
+        # replays one origin's response, with or without Access-Control-Allow-Origin, to another
+        vary = [value for name, value in headers if name == b"vary"]
+        vary.append(b"Origin")
+        _set_header(headers, b"vary", b", ".join(vary))
+
+        await send(message)
@@ -0,0 +1,45 @@
+"""
+Request logging middleware (pure ASGI).
+Logs method, path, status and duration of every HTTP request without the task/Request/Response
+overhead of @app.middleware("http") (BaseHTTPMiddleware).
+"""
+import time
+import logging
+
+logger = logging.getLogger("backend.main")
+
+
+class RequestLoggingMiddleware:
+    """Log every HTTP request: method, path, status, duration (measured until the last body chunk is sent)."""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        start = time.perf_counter()
+        status_code = 500
+
+        async def send_wrapper(message):
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+            if message["type"] == "http.response.body" and not message.get("more_body", False):
+                duration_ms = (time.perf_counter() - start) * 1000
+                if not logger.isEnabledFor(logging.INFO):
+                    return
+                # Text handlers format the message lazily; the JSON formatter emits the "http" fields
+                logger.info(
+                    "%s %s %s %.2fms",
+                    scope["method"],
+                    scope["path"],
+                    status_code,
+                    duration_ms,
+                    extra={"http": {"m": scope["method"], "p": scope["path"], "s": status_code, "d": round(duration_ms, 2)}},
+                )
+
+        await self.app(scope, receive, send_wrapper)
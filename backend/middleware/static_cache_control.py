@@ -0,0 +1,32 @@
+"""
+Far-future caching for /static (pure ASGI).
+/static only holds uploads (profile pictures, employee documents, policy documents). Each is written
+once under a uuid4 name that is never reused, so a URL never gets new content and browsers can skip
+revalidation. The files include employees' personal documents, so only the user's browser may keep
+them (private): a shared cache must not hold them past deletion.
+"""
+
+STATIC_PREFIX = "/static/"
+STATIC_CACHE_CONTROL = (b"cache-control", b"private, max-age=31536000, immutable")
+
+
+class StaticCacheControlMiddleware:
+    """Add Cache-Control: private, max-age=31536000, immutable to successful /static responses."""
+
+    def __init__(self, app, prefix: str = STATIC_PREFIX):
+        self.app = app
+        self.prefix = prefix
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or not scope["path"].startswith(self.prefix):
+            await self.app(scope, receive, send)
+            return
+
+        async def send_wrapper(message):
+            if message["type"] == "http.response.start" and message["status"] in (200, 304):
+                headers = message.setdefault("headers", [])
+                if not any(name == b"cache-control" for name, _ in headers):
+                    message["headers"] = list(headers) + [STATIC_CACHE_CONTROL]
+            await send(message)
+
+        await self.app(scope, receive, send_wrapper)
@@ -1,9 +1,11 @@
 """
 Balance-related SQLAlchemy models
 """
-from sqlalchemy import Column, Integer, DECIMAL, Text, DateTime, ForeignKey, Enum as SQLEnum, UniqueConstraint, Index, text  # type: ignore
-from sqlalchemy.orm import relationship  # type: ignore
+from sqlalchemy import Integer, DECIMAL, Text, DateTime, ForeignKey, Enum as SQLEnum, UniqueConstraint, Index, text  # type: ignore
+from sqlalchemy.orm import relationship, Mapped, mapped_column  # type: ignore
+from decimal import Decimal
 from datetime import datetime
+from typing import Optional
 from backend.db import Base
 from backend.models.enums import LeaveTypeEnum, BalanceChangeTypeEnum
 
@@ -12,18 +14,17 @@ class UserLeaveBalance(Base):
     """User leave balances table"""
     __tablename__ = "user_leave_balances"
     
-    id = Column(Integer, primary_key=True, autoincrement=True)
-    user_id = Column(Integer, ForeignKey("users.id", ondelete="CASCADE", onupdate="CASCADE"), nullable=False)
-    leave_type = Column(SQLEnum(LeaveTypeEnum), nullable=False)
-    balance = Column(DECIMAL(5, 2), nullable=False, default=0.00)
-    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow, server_default=text("CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP"))
+    id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
+    user_id: Mapped[int] = mapped_column(Integer, ForeignKey("users.id", ondelete="CASCADE", onupdate="CASCADE"), nullable=False)
+    leave_type: Mapped[LeaveTypeEnum] = mapped_column(SQLEnum(LeaveTypeEnum), nullable=False)
+    balance: Mapped[Decimal] = mapped_column(DECIMAL(5, 2), nullable=False, default=0.00)
+    updated_at: Mapped[Optional[datetime]] = mapped_column(DateTime, default=datetime.utcnow, server_default=text("CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP"))
     
     # Relationships
     user = relationship("User", back_populates="leave_balances")
     
     __table_args__ = (
         UniqueConstraint("user_id", "leave_type", name="unique_user_leave_type"),
-        Index("idx_user_id", "user_id"),
         Index("idx_leave_type", "leave_type"),
     )
 
@@ -32,20 +33,19 @@ class UserBalanceHistory(Base):
     """User balance history table - audit trail"""
     __tablename__ = "user_balance_history"
     
-    id = Column(Integer, primary_key=True, autoincrement=True)
-    user_id = Column(Integer, ForeignKey("users.id", ondelete="CASCADE", onupdate="CASCADE"), nullable=False)
-    leave_type = Column(SQLEnum(LeaveTypeEnum), nullable=False)
-    previous_balance = Column(DECIMAL(5, 2), nullable=False)
-    new_balance = Column(DECIMAL(5, 2), nullable=False)
-    change_amount = Column(DECIMAL(5, 2), nullable=False, comment="Positive for addition, negative for deduction")
-    change_type = Column(SQLEnum(BalanceChangeTypeEnum), nullable=False)
-    reason = Column(Text, nullable=True)
-    related_leave_id = Column(Integer, ForeignKey("leave_requests.id", ondelete="SET NULL", onupdate="CASCADE"), nullable=True)
-    changed_by = Column(Integer, ForeignKey("users.id", ondelete="SET NULL", onupdate="CASCADE"), nullable=True)
-    changed_at = Column(DateTime, default=datetime.utcnow, server_default=text("CURRENT_TIMESTAMP"))
+    id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
+    user_id: Mapped[int] = mapped_column(Integer, ForeignKey("users.id", ondelete="CASCADE", onupdate="CASCADE"), nullable=False)
+    leave_type: Mapped[LeaveTypeEnum] = mapped_column(SQLEnum(LeaveTypeEnum), nullable=False)
+    previous_balance: Mapped[Decimal] = mapped_column(DECIMAL(5, 2), nullable=False)
+    new_balance: Mapped[Decimal] = mapped_column(DECIMAL(5, 2), nullable=False)
+    change_amount: Mapped[Decimal] = mapped_column(DECIMAL(5, 2), nullable=False, comment="Positive for addition, negative for deduction")
+    change_type: Mapped[BalanceChangeTypeEnum] = mapped_column(SQLEnum(BalanceChangeTypeEnum), nullable=False)
+    reason: Mapped[Optional[str]] = mapped_column(Text, nullable=True)
+    related_leave_id: Mapped[Optional[int]] = mapped_column(Integer, ForeignKey("leave_requests.id", ondelete="SET NULL", onupdate="CASCADE"), nullable=True)
+    changed_by: Mapped[Optional[int]] = mapped_column(Integer, ForeignKey("users.id", ondelete="SET NULL", onupdate="CASCADE"), nullable=True)
+    changed_at: Mapped[Optional[datetime]] = mapped_column(DateTime, default=datetime.utcnow, server_default=text("CURRENT_TIMESTAMP"))
     
     __table_args__ = (
-        Index("idx_user_id", "user_id"),
         Index("idx_leave_type", "leave_type"),
         Index("idx_change_type", "change_type"),
         Index("idx_changed_at", "changed_at"),
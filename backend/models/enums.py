@@ -1,5 +1,7 @@
 """
 SQLAlchemy Enum definitions
+Mapped to native MySQL ENUM columns, which InnoDB stores as a 1-byte index into the value list
+(2 bytes past 255 values) - the same row and index width as a TINYINT code, with readable values.
 """
 import enum
 
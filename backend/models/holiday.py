@@ -1,7 +1,10 @@
 """
 Holiday SQLAlchemy model
 """
-from sqlalchemy import Column, Integer, String, Boolean, Date, Index  # type: ignore
+from sqlalchemy import Integer, String, Boolean, Date, Index  # type: ignore
+from sqlalchemy.orm import Mapped, mapped_column  # type: ignore
+from datetime import date as date_type
+from typing import Optional
 from backend.db import Base
 
 
@@ -9,14 +12,14 @@ class Holiday(Base):
     """Holidays table"""
     __tablename__ = "holidays"
     
-    id = Column(Integer, primary_key=True, autoincrement=True)
-    name = Column(String(255), nullable=False)
-    date = Column(Date, nullable=False, unique=True)
-    year = Column(Integer, nullable=False)
-    is_optional = Column(Boolean, default=False, comment="Optional holiday")
+    id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
+    name: Mapped[str] = mapped_column(String(255), nullable=False)
+    date: Mapped[date_type] = mapped_column(Date, nullable=False, unique=True)
+    year: Mapped[int] = mapped_column(Integer, nullable=False)
+    is_optional: Mapped[Optional[bool]] = mapped_column(Boolean, default=False, comment="Optional holiday")
     
+    # date needs no separate index: its UNIQUE key serves lookups, duplicate rejection and ORDER BY date
     __table_args__ = (
-        Index("idx_year", "year"),
-        Index("idx_date", "date"),
+        Index("idx_holidays_year", "year"),
         Index("idx_year_optional", "year", "is_optional"),
     )
@@ -1,24 +1,25 @@
 """
 Job log SQLAlchemy model
 """
-from sqlalchemy import Column, Integer, String, DateTime, Enum as SQLEnum, JSON, Index, text  # type: ignore
+from sqlalchemy import Integer, String, DateTime, Enum as SQLEnum, JSON, Index, text  # type: ignore
+from sqlalchemy.orm import Mapped, mapped_column  # type: ignore
 from datetime import datetime
 from backend.db import Base
 from backend.models.enums import JobStatusEnum
 from typing import Optional, Any, Dict
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, ConfigDict, Field
 
 
 class JobLog(Base):
     """Job logs table"""
     __tablename__ = "job_logs"
     
-    id = Column(Integer, primary_key=True, autoincrement=True)
-    job_name = Column(String(255), unique=True, nullable=False, comment="Unique identifier")
-    executed_at = Column(DateTime, default=datetime.utcnow, server_default=text("CURRENT_TIMESTAMP"))
-    status = Column(SQLEnum(JobStatusEnum), nullable=False)
-    details = Column(JSON, nullable=True, comment="Audit logs or result summary as JSON")
-    executed_by = Column(String(255), nullable=True, comment="User who triggered the job")
+    id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
+    job_name: Mapped[str] = mapped_column(String(255), unique=True, nullable=False, comment="Unique identifier")
+    executed_at: Mapped[Optional[datetime]] = mapped_column(DateTime, default=datetime.utcnow, server_default=text("CURRENT_TIMESTAMP"))
+    status: Mapped[JobStatusEnum] = mapped_column(SQLEnum(JobStatusEnum), nullable=False)
+    details: Mapped[Optional[dict]] = mapped_column(JSON, nullable=True, comment="Audit logs or result summary as JSON")
+    executed_by: Mapped[Optional[str]] = mapped_column(String(255), nullable=True, comment="User who triggered the job")
     
     __table_args__ = (
         Index("idx_job_name", "job_name"),
@@ -40,8 +41,7 @@ class _JobLogPydantic(BaseModel):
     details: Optional[Dict[str, Any]] = Field(default_factory=dict, description="Audit logs or result summary as JSON")
     executed_by: Optional[str] = None
 
-    class Config:
-        populate_by_name = True
+    model_config = ConfigDict(populate_by_name=True)
 
 # Export Pydantic model as JobLogSchema
 # Note: SQLAlchemy JobLog model is kept as JobLog
@@ -1,33 +1,34 @@
 """
 Leave-related SQLAlchemy models
 """
-from sqlalchemy import Column, Integer, String, Boolean, Date, DateTime, Text, DECIMAL, ForeignKey, Enum as SQLEnum, Index, text  # type: ignore
-from sqlalchemy.orm import relationship  # type: ignore
+from sqlalchemy import Integer, String, Boolean, Date, DateTime, Text, DECIMAL, ForeignKey, Enum as SQLEnum, Index, text  # type: ignore
+from sqlalchemy.orm import relationship, Mapped, mapped_column  # type: ignore
+from decimal import Decimal
 from datetime import datetime, date
 from backend.db import Base
 from backend.models.enums import LeaveTypeEnum, LeaveStatusEnum, CompOffStatusEnum
 from enum import Enum
 from typing import Optional
-from pydantic import BaseModel
+from pydantic import BaseModel, ConfigDict
 
 
 class LeaveRequestModel(Base):
     """Leave requests table"""
     __tablename__ = "leave_requests"
     
-    id = Column(Integer, primary_key=True, autoincrement=True)
-    applicant_id = Column(Integer, ForeignKey("users.id", ondelete="CASCADE", onupdate="CASCADE"), nullable=False)
-    approver_id = Column(Integer, ForeignKey("users.id", ondelete="SET NULL", onupdate="CASCADE"), nullable=True)
-    type = Column(SQLEnum(LeaveTypeEnum), nullable=False)
-    start_date = Column(Date, nullable=False)
-    end_date = Column(Date, nullable=True, comment="NULL for open-ended Sabbatical leaves")
-    deductible_days = Column(DECIMAL(5, 2), nullable=False, default=0.00)
-    status = Column(SQLEnum(LeaveStatusEnum), nullable=False, default="PENDING")
-    reason = Column(Text, nullable=True)
-    created_at = Column(DateTime, default=datetime.utcnow, server_default=text("CURRENT_TIMESTAMP"))
-    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow, server_default=text("CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP"))
-    approved_at = Column(DateTime, nullable=True)
-    rejected_at = Column(DateTime, nullable=True)
+    id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
+    applicant_id: Mapped[int] = mapped_column(Integer, ForeignKey("users.id", ondelete="CASCADE", onupdate="CASCADE"), nullable=False)
+    approver_id: Mapped[Optional[int]] = mapped_column(Integer, ForeignKey("users.id", ondelete="SET NULL", onupdate="CASCADE"), nullable=True)
+    type: Mapped[LeaveTypeEnum] = mapped_column(SQLEnum(LeaveTypeEnum), nullable=False)
+    start_date: Mapped[date] = mapped_column(Date, nullable=False)
+    end_date: Mapped[Optional[date]] = mapped_column(Date, nullable=True, comment="NULL for open-ended Sabbatical leaves")
+    deductible_days: Mapped[Decimal] = mapped_column(DECIMAL(5, 2), nullable=False, default=0.00)
+    status: Mapped[LeaveStatusEnum] = mapped_column(SQLEnum(LeaveStatusEnum), nullable=False, default="PENDING")
+    reason: Mapped[Optional[str]] = mapped_column(Text, nullable=True)
+    created_at: Mapped[Optional[datetime]] = mapped_column(DateTime, default=datetime.utcnow, server_default=text("CURRENT_TIMESTAMP"))
+    updated_at: Mapped[Optional[datetime]] = mapped_column(DateTime, default=datetime.utcnow, server_default=text("CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP"))
+    approved_at: Mapped[Optional[datetime]] = mapped_column(DateTime, nullable=True)
+    rejected_at: Mapped[Optional[datetime]] = mapped_column(DateTime, nullable=True)
     
     # Relationships
     applicant = relationship("User", foreign_keys=[applicant_id], back_populates="leave_requests")
@@ -49,15 +50,15 @@ class CompOffClaimModel(Base):
     """Comp-off claims table"""
     __tablename__ = "comp_off_claims"
     
-    id = Column(Integer, primary_key=True, autoincrement=True)
-    claimant_id = Column(Integer, ForeignKey("users.id", ondelete="CASCADE", onupdate="CASCADE"), nullable=False)
-    approver_id = Column(Integer, ForeignKey("users.id", ondelete="SET NULL", onupdate="CASCADE"), nullable=True)
-    work_date = Column(Date, nullable=False, comment="Date on which employee worked")
-    reason = Column(Text, nullable=False)
-    status = Column(SQLEnum(CompOffStatusEnum), nullable=False, default="PENDING")
-    created_at = Column(DateTime, default=datetime.utcnow, server_default=text("CURRENT_TIMESTAMP"))
-    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow, server_default=text("CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP"))
-    approved_at = Column(DateTime, nullable=True)
+    id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
+    claimant_id: Mapped[int] = mapped_column(Integer, ForeignKey("users.id", ondelete="CASCADE", onupdate="CASCADE"), nullable=False)
+    approver_id: Mapped[Optional[int]] = mapped_column(Integer, ForeignKey("users.id", ondelete="SET NULL", onupdate="CASCADE"), nullable=True)
+    work_date: Mapped[date] = mapped_column(Date, nullable=False, comment="Date on which employee worked")
+    reason: Mapped[str] = mapped_column(Text, nullable=False)
+    status: Mapped[CompOffStatusEnum] = mapped_column(SQLEnum(CompOffStatusEnum), nullable=False, default="PENDING")
+    created_at: Mapped[Optional[datetime]] = mapped_column(DateTime, default=datetime.utcnow, server_default=text("CURRENT_TIMESTAMP"))
+    updated_at: Mapped[Optional[datetime]] = mapped_column(DateTime, default=datetime.utcnow, server_default=text("CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP"))
+    approved_at: Mapped[Optional[datetime]] = mapped_column(DateTime, nullable=True)
     
     __table_args__ = (
         Index("idx_claimant_id", "claimant_id"),
@@ -73,16 +74,16 @@ class LeaveComment(Base):
     """Leave comments table"""
     __tablename__ = "leave_comments"
     
-    id = Column(Integer, primary_key=True, autoincrement=True)
-    leave_id = Column(Integer, ForeignKey("leave_requests.id", ondelete="CASCADE", onupdate="CASCADE"), nullable=False)
-    user_id = Column(Integer, ForeignKey("users.id", ondelete="CASCADE", onupdate="CASCADE"), nullable=False)
-    comment = Column(Text, nullable=False)
-    is_internal = Column(Boolean, default=False, comment="Internal notes not visible to applicant")
-    created_at = Column(DateTime, default=datetime.utcnow, server_default=text("CURRENT_TIMESTAMP"))
+    id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
+    leave_id: Mapped[int] = mapped_column(Integer, ForeignKey("leave_requests.id", ondelete="CASCADE", onupdate="CASCADE"), nullable=False)
+    user_id: Mapped[int] = mapped_column(Integer, ForeignKey("users.id", ondelete="CASCADE", onupdate="CASCADE"), nullable=False)
+    comment: Mapped[str] = mapped_column(Text, nullable=False)
+    is_internal: Mapped[Optional[bool]] = mapped_column(Boolean, default=False, comment="Internal notes not visible to applicant")
+    created_at: Mapped[Optional[datetime]] = mapped_column(DateTime, default=datetime.utcnow, server_default=text("CURRENT_TIMESTAMP"))
     
     __table_args__ = (
         Index("idx_leave_id", "leave_id"),
-        Index("idx_user_id", "user_id"),
+        Index("idx_leave_comments_user_id", "user_id"),
         Index("idx_created_at", "created_at"),
         Index("idx_is_internal", "is_internal"),
     )
@@ -92,14 +93,14 @@ class LeaveAttachment(Base):
     """Leave attachments table"""
     __tablename__ = "leave_attachments"
     
-    id = Column(Integer, primary_key=True, autoincrement=True)
-    leave_id = Column(Integer, ForeignKey("leave_requests.id", ondelete="CASCADE", onupdate="CASCADE"), nullable=False)
-    name = Column(String(255), nullable=False)
-    url = Column(String(500), nullable=False)
-    file_type = Column(String(50), nullable=True)
-    file_size = Column(Integer, nullable=True, comment="File size in bytes")
-    uploaded_by = Column(Integer, ForeignKey("users.id", ondelete="CASCADE", onupdate="CASCADE"), nullable=False)
-    uploaded_at = Column(DateTime, default=datetime.utcnow, server_default=text("CURRENT_TIMESTAMP"))
+    id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
+    leave_id: Mapped[int] = mapped_column(Integer, ForeignKey("leave_requests.id", ondelete="CASCADE", onupdate="CASCADE"), nullable=False)
+    name: Mapped[str] = mapped_column(String(255), nullable=False)
+    url: Mapped[str] = mapped_column(String(500), nullable=False)
+    file_type: Mapped[Optional[str]] = mapped_column(String(50), nullable=True)
+    file_size: Mapped[Optional[int]] = mapped_column(Integer, nullable=True, comment="File size in bytes")
+    uploaded_by: Mapped[int] = mapped_column(Integer, ForeignKey("users.id", ondelete="CASCADE", onupdate="CASCADE"), nullable=False)
+    uploaded_at: Mapped[Optional[datetime]] = mapped_column(DateTime, default=datetime.utcnow, server_default=text("CURRENT_TIMESTAMP"))
     
     __table_args__ = (
         Index("idx_leave_id", "leave_id"),
@@ -162,8 +163,8 @@ class LeaveRequestSchema(LeaveRequestBase):
     approved_at: Optional[datetime] = None
     rejected_at: Optional[datetime] = None
 
-    class Config:
-        from_attributes = True
+    # Response-only models: read from ORM attributes, immutable, unknown attributes ignored
+    model_config = ConfigDict(from_attributes=True, frozen=True, extra="ignore")
 
 # Export SQLAlchemy models with their original names for backward compatibility
 # Note: These are re-exported in __init__.py to avoid conflicts
@@ -190,8 +191,8 @@ class CompOffClaimSchema(CompOffClaimBase):
     updated_at: Optional[datetime] = None
     approved_at: Optional[datetime] = None
 
-    class Config:
-        from_attributes = True
+    # Response-only models: read from ORM attributes, immutable, unknown attributes ignored
+    model_config = ConfigDict(from_attributes=True, frozen=True, extra="ignore")
 
 # Export SQLAlchemy models with their original names for backward compatibility
 # Note: These are re-exported in __init__.py to avoid conflicts
@@ -214,5 +215,5 @@ class Holiday(HolidayBase):
     """Model for holiday response"""
     id: int
 
-    class Config:
-        from_attributes = True
+    # Response-only models: read from ORM attributes, immutable, unknown attributes ignored
+    model_config = ConfigDict(from_attributes=True, frozen=True, extra="ignore")
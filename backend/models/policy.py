@@ -1,12 +1,12 @@
 """
 Policy-related SQLAlchemy models
 """
-from sqlalchemy import Column, Integer, String, Boolean, DateTime, ForeignKey, UniqueConstraint, Index, text  # type: ignore
-from sqlalchemy.orm import relationship  # type: ignore
+from sqlalchemy import Integer, String, Boolean, DateTime, ForeignKey, UniqueConstraint, Index, text  # type: ignore
+from sqlalchemy.orm import relationship, selectinload, raiseload, Mapped, mapped_column  # type: ignore
 from datetime import datetime
-from backend.db import Base
+from backend.db import Base, RAISELOAD_GUARD
 from typing import Optional, List
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, ConfigDict, Field
 
 
 # Define PolicyDocument before Policy since Policy has a relationship to PolicyDocument
@@ -14,17 +14,17 @@ class PolicyDocument(Base):
     """Policy documents table"""
     __tablename__ = "policy_documents"
     
-    id = Column(Integer, primary_key=True, autoincrement=True)
-    policy_id = Column(Integer, ForeignKey("policies.id", ondelete="CASCADE", onupdate="CASCADE"), nullable=False)
-    name = Column(String(255), nullable=False)
-    url = Column(String(500), nullable=False)
-    uploaded_at = Column(DateTime, default=datetime.utcnow, server_default=text("CURRENT_TIMESTAMP"))
+    id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
+    policy_id: Mapped[int] = mapped_column(Integer, ForeignKey("policies.id", ondelete="CASCADE", onupdate="CASCADE"), nullable=False)
+    name: Mapped[str] = mapped_column(String(255), nullable=False)
+    url: Mapped[str] = mapped_column(String(500), nullable=False)
+    uploaded_at: Mapped[Optional[datetime]] = mapped_column(DateTime, default=datetime.utcnow, server_default=text("CURRENT_TIMESTAMP"))
     
     # Relationships
     policy = relationship("Policy", back_populates="policy_documents")
     
     __table_args__ = (
-        Index("idx_policy_id", "policy_id"),
+        Index("idx_policy_documents_policy_id", "policy_id"),
         Index("idx_uploaded_at", "uploaded_at"),
     )
 
@@ -33,39 +33,49 @@ class Policy(Base):
     """Policies table"""
     __tablename__ = "policies"
     
-    id = Column(Integer, primary_key=True, autoincrement=True)
-    year = Column(Integer, unique=True, nullable=False, comment="Year for which policy is active")
-    casual_leave_quota = Column(Integer, nullable=False, default=12)
-    sick_leave_quota = Column(Integer, nullable=False, default=5)
-    wfh_quota = Column(Integer, nullable=False, default=2)
-    is_active = Column(Boolean, default=False, comment="Only one policy should be active per year")
-    is_deleted = Column(Boolean, default=False, nullable=False, comment="Soft delete: hide from list but keep policy and documents")
-    created_at = Column(DateTime, default=datetime.utcnow, server_default=text("CURRENT_TIMESTAMP"))
-    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow, server_default=text("CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP"))
+    id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
+    year: Mapped[int] = mapped_column(Integer, unique=True, nullable=False, comment="Year for which policy is active")
+    casual_leave_quota: Mapped[int] = mapped_column(Integer, nullable=False, default=12)
+    sick_leave_quota: Mapped[int] = mapped_column(Integer, nullable=False, default=5)
+    wfh_quota: Mapped[int] = mapped_column(Integer, nullable=False, default=2)
+    is_active: Mapped[Optional[bool]] = mapped_column(Boolean, default=False, comment="Only one policy should be active per year")
+    is_deleted: Mapped[bool] = mapped_column(Boolean, default=False, nullable=False, comment="Soft delete: hide from list but keep policy and documents")
+    created_at: Mapped[Optional[datetime]] = mapped_column(DateTime, default=datetime.utcnow, server_default=text("CURRENT_TIMESTAMP"))
+    updated_at: Mapped[Optional[datetime]] = mapped_column(DateTime, default=datetime.utcnow, server_default=text("CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP"))
     
     # Relationships
     policy_documents = relationship("PolicyDocument", back_populates="policy", cascade="all, delete-orphan")
     
     __table_args__ = (
-        Index("idx_year", "year"),
-        Index("idx_is_active", "is_active"),
+        Index("idx_policies_year", "year"),
+        Index("idx_active_year", "is_active", "year"),
     )
 
 
+def load_policy_full(stmt):
+    """
+    Eager-load policy_documents on a select(Policy) statement. With SQLALCHEMY_RAISELOAD set, any other
+    relationship access on the loaded policies raises instead of lazy-loading.
+    """
+    stmt = stmt.options(selectinload(Policy.policy_documents))
+    if RAISELOAD_GUARD:
+        stmt = stmt.options(raiseload("*"))
+    return stmt
+
+
 class PolicyAcknowledgment(Base):
     """Policy acknowledgments table"""
     __tablename__ = "policy_acknowledgments"
     
-    id = Column(Integer, primary_key=True, autoincrement=True)
-    user_id = Column(Integer, ForeignKey("users.id", ondelete="CASCADE", onupdate="CASCADE"), nullable=False)
-    year = Column(Integer, nullable=False, comment="Policy year")
-    document_url = Column(String(500), nullable=False, comment="URL of the acknowledged document")
-    acknowledged_at = Column(DateTime, default=datetime.utcnow, server_default=text("CURRENT_TIMESTAMP"))
+    id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
+    user_id: Mapped[int] = mapped_column(Integer, ForeignKey("users.id", ondelete="CASCADE", onupdate="CASCADE"), nullable=False)
+    year: Mapped[int] = mapped_column(Integer, nullable=False, comment="Policy year")
+    document_url: Mapped[str] = mapped_column(String(500), nullable=False, comment="URL of the acknowledged document")
+    acknowledged_at: Mapped[Optional[datetime]] = mapped_column(DateTime, default=datetime.utcnow, server_default=text("CURRENT_TIMESTAMP"))
     
     __table_args__ = (
         UniqueConstraint("user_id", "year", "document_url", name="unique_user_document_year"),
-        Index("idx_user_id", "user_id"),
-        Index("idx_year", "year"),
+        # idx_user_year / idx_year_document also serve user_id-only and year-only lookups (leading column)
         Index("idx_user_year", "user_id", "year"),
         Index("idx_year_document", "year", "document_url"),
         Index("idx_acknowledged_at", "acknowledged_at"),
@@ -84,8 +94,7 @@ class _PolicyDocumentPydantic(BaseModel):
     url: str
     uploaded_at: Optional[datetime] = None
 
-    class Config:
-        from_attributes = True
+    model_config = ConfigDict(from_attributes=True)
 
 # Export Pydantic model as PolicyDocumentSchema
 # Note: SQLAlchemy PolicyDocument model is kept as PolicyDocument
@@ -97,8 +106,7 @@ class DocumentsByYearItem(BaseModel):
     year: int
     documents: List["PolicyDocumentSchema"] = []
 
-    class Config:
-        from_attributes = True
+    model_config = ConfigDict(from_attributes=True)
 
 
 class LeavePolicy(BaseModel):
@@ -117,9 +125,7 @@ class LeavePolicy(BaseModel):
     created_at: Optional[datetime] = None
     updated_at: Optional[datetime] = None
 
-    class Config:
-        populate_by_name = True
-        from_attributes = True
+    model_config = ConfigDict(populate_by_name=True, from_attributes=True)
 
 
 # Pydantic PolicyAcknowledgment model
@@ -132,8 +138,7 @@ class _PolicyAcknowledgmentPydantic(BaseModel):
     document_url: str
     acknowledged_at: Optional[datetime] = None
 
-    class Config:
-        from_attributes = True
+    model_config = ConfigDict(from_attributes=True)
 
 # Export Pydantic model as PolicyAcknowledgmentSchema
 # Note: SQLAlchemy PolicyAcknowledgment model is kept as PolicyAcknowledgment
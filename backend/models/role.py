@@ -1,9 +1,13 @@
 """
 Role-related SQLAlchemy models
 """
-from sqlalchemy import Column, Integer, String, Boolean, Text, DateTime, ForeignKey, UniqueConstraint, Index, text  # type: ignore
-from sqlalchemy.orm import relationship  # type: ignore
+from sqlalchemy import Integer, String, Boolean, Text, DateTime, ForeignKey, UniqueConstraint, Index, text, bindparam, event  # type: ignore
+from sqlalchemy import inspect as sa_inspect  # type: ignore
+from sqlalchemy.orm import Session, relationship, Mapped, mapped_column  # type: ignore
+from sqlalchemy.orm.attributes import set_committed_value  # type: ignore
+from sqlalchemy.orm.util import identity_key  # type: ignore
 from datetime import datetime
+from typing import Optional
 from backend.db import Base
 
 
@@ -11,12 +15,12 @@ class Role(Base):
     """Roles table"""
     __tablename__ = "roles"
     
-    id = Column(Integer, primary_key=True, autoincrement=True)
-    name = Column(String(50), unique=True, nullable=False, comment="Role identifier")
-    display_name = Column(String(100), nullable=False, comment="Human-readable role name")
-    description = Column(Text, nullable=True)
-    is_active = Column(Boolean, default=True)
-    created_at = Column(DateTime, default=datetime.utcnow, server_default=text("CURRENT_TIMESTAMP"))
+    id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
+    name: Mapped[str] = mapped_column(String(50), unique=True, nullable=False, comment="Role identifier")
+    display_name: Mapped[str] = mapped_column(String(100), nullable=False, comment="Human-readable role name")
+    description: Mapped[Optional[str]] = mapped_column(Text, nullable=True)
+    is_active: Mapped[Optional[bool]] = mapped_column(Boolean, default=True)
+    created_at: Mapped[Optional[datetime]] = mapped_column(DateTime, default=datetime.utcnow, server_default=text("CURRENT_TIMESTAMP"))
     
     # Relationships
     role_scopes = relationship("RoleScope", back_populates="role", cascade="all, delete-orphan")
@@ -24,7 +28,6 @@ class Role(Base):
     
     __table_args__ = (
         Index("idx_name", "name"),
-        Index("idx_active", "is_active"),
     )
 
 
@@ -32,10 +35,10 @@ class RoleScope(Base):
     """Role scopes table - maps roles to OAuth2 scopes"""
     __tablename__ = "role_scopes"
     
-    id = Column(Integer, primary_key=True, autoincrement=True)
-    role_id = Column(Integer, ForeignKey("roles.id", ondelete="CASCADE", onupdate="CASCADE"), nullable=False)
-    scope_name = Column(String(100), nullable=False, comment="OAuth2 scope name")
-    created_at = Column(DateTime, default=datetime.utcnow, server_default=text("CURRENT_TIMESTAMP"))
+    id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
+    role_id: Mapped[int] = mapped_column(Integer, ForeignKey("roles.id", ondelete="CASCADE", onupdate="CASCADE"), nullable=False)
+    scope_name: Mapped[str] = mapped_column(String(100), nullable=False, comment="OAuth2 scope name")
+    created_at: Mapped[Optional[datetime]] = mapped_column(DateTime, default=datetime.utcnow, server_default=text("CURRENT_TIMESTAMP"))
     
     # Relationships
     role = relationship("Role", back_populates="role_scopes")
@@ -51,20 +54,66 @@ class UserRole(Base):
     """User roles table - many-to-many user-role relationship"""
     __tablename__ = "user_roles"
     
-    id = Column(Integer, primary_key=True, autoincrement=True)
-    user_id = Column(Integer, ForeignKey("users.id", ondelete="CASCADE", onupdate="CASCADE"), nullable=False)
-    role_id = Column(Integer, ForeignKey("roles.id", ondelete="CASCADE", onupdate="CASCADE"), nullable=False)
-    assigned_by = Column(Integer, ForeignKey("users.id", ondelete="SET NULL", onupdate="CASCADE"), nullable=True, comment="User who assigned this role")
-    assigned_at = Column(DateTime, default=datetime.utcnow, server_default=text("CURRENT_TIMESTAMP"))
-    is_active = Column(Boolean, default=True)
+    id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
+    user_id: Mapped[int] = mapped_column(Integer, ForeignKey("users.id", ondelete="CASCADE", onupdate="CASCADE"), nullable=False)
+    role_id: Mapped[int] = mapped_column(Integer, ForeignKey("roles.id", ondelete="CASCADE", onupdate="CASCADE"), nullable=False)
+    # Audit-only user id, no FK: skips a parent-key probe and the FK's index on every role assignment
+    assigned_by: Mapped[Optional[int]] = mapped_column(Integer, nullable=True, comment="User who assigned this role")
+    assigned_at: Mapped[Optional[datetime]] = mapped_column(DateTime, default=datetime.utcnow, server_default=text("CURRENT_TIMESTAMP"))
+    is_active: Mapped[Optional[bool]] = mapped_column(Boolean, default=True)
     
     # Relationships
     user = relationship("User", foreign_keys=[user_id], back_populates="user_roles")
     role = relationship("Role", back_populates="user_roles")
     
     __table_args__ = (
+        # Serves user_id lookups (leading column); idx_role_user_active serves role -> active users.
+        # is_active in the key caps each (user, role) at one active + one inactive row; update_user reactivates
+        # or deletes instead of adding rows, so the table cannot accumulate inactive duplicates.
         UniqueConstraint("user_id", "role_id", "is_active", name="unique_user_role_active"),
-        Index("idx_user_id", "user_id"),
-        Index("idx_role_id", "role_id"),
-        Index("idx_active", "is_active"),
+        Index("idx_role_user_active", "role_id", "user_id", "is_active"),
     )
+
+
+# users.primary_role is a denormalized copy of the active role name; recomputed after any flush that
+# touches user_roles (or renames/deletes a role), inside the same transaction
+_SYNC_PRIMARY_ROLE = text(
+    "UPDATE users SET primary_role = ("
+    "SELECT LOWER(r.name) FROM user_roles ur JOIN roles r ON r.id = ur.role_id "
+    "WHERE ur.user_id = users.id AND ur.is_active = 1 ORDER BY ur.assigned_at DESC, ur.id DESC LIMIT 1"
+    ") WHERE id IN :user_ids"
+).bindparams(bindparam("user_ids", expanding=True))
+_USERS_WITH_ROLES = text("SELECT DISTINCT user_id FROM user_roles WHERE role_id IN :role_ids").bindparams(
+    bindparam("role_ids", expanding=True)
+)
+_READ_PRIMARY_ROLE = text("SELECT id, primary_role FROM users WHERE id IN :user_ids").bindparams(
+    bindparam("user_ids", expanding=True)
+)
+
+
+@event.listens_for(Session, "after_flush")
+def _sync_primary_role(session: Session, _flush_context) -> None:
+    changed = list(session.new) + list(session.dirty) + list(session.deleted)
+    # state.dict: read without triggering a load (deleted/expired rows)
+    user_ids = {
+        sa_inspect(obj).dict.get("user_id") for obj in changed if isinstance(obj, UserRole)
+    }
+    user_ids.discard(None)
+    role_ids = [obj.id for obj in changed if isinstance(obj, Role) and obj not in session.new]
+    if not user_ids and not role_ids:
+        return
+
+    conn = session.connection()
+    if role_ids:
+        user_ids.update(conn.execute(_USERS_WITH_ROLES, {"role_ids": role_ids}).scalars())
+    if not user_ids:
+        return
+    params = {"user_ids": sorted(user_ids)}
+    conn.execute(_SYNC_PRIMARY_ROLE, params)
+
+    # Keep loaded User objects in step without expiring them (an expired attribute would lazy-load)
+    from backend.models.user import User
+    for user_id, primary_role in conn.execute(_READ_PRIMARY_ROLE, params):
+        user = session.identity_map.get(identity_key(User, user_id))
+        if user is not None:
+            set_committed_value(user, "primary_role", primary_role)
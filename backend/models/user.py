@@ -1,71 +1,104 @@
 """
 User-related SQLAlchemy models
 """
-from sqlalchemy import Column, Integer, String, Boolean, Date, DateTime, Text, ForeignKey, Index, text  # type: ignore
-from sqlalchemy.orm import relationship  # type: ignore
+from sqlalchemy import Integer, String, Boolean, Date, DateTime, Text, ForeignKey, Index, text  # type: ignore
+from sqlalchemy.orm import relationship, selectinload, raiseload, Mapped, mapped_column  # type: ignore
 from datetime import datetime, date
-from backend.db import Base
+from backend.db import Base, RAISELOAD_GUARD
+from dataclasses import dataclass, fields
 from enum import Enum
 from typing import Optional, List
-from pydantic import BaseModel, EmailStr, Field, field_validator
+from pydantic import BaseModel, ConfigDict, EmailStr, Field, field_validator
 
 
 class User(Base):
-    """Users table"""
+    """
+    Users table: identity, auth, hierarchy and employment columns only.
+    Profile/family/address fields live in user_profiles (UserProfile); load them with selectinload(User.profile)
+    where a response needs them, so auth lookups on users stay narrow.
+    """
     __tablename__ = "users"
     
-    id = Column(Integer, primary_key=True, autoincrement=True)
-    employee_id = Column(String(50), unique=True, nullable=False, comment="Unique Employee ID")
-    email = Column(String(255), unique=True, nullable=False, comment="Unique Email Address")
-    full_name = Column(String(255), nullable=False)
+    id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
+    employee_id: Mapped[str] = mapped_column(String(50), unique=True, nullable=False, comment="Unique Employee ID")
+    email: Mapped[str] = mapped_column(String(255), unique=True, nullable=False, comment="Unique Email Address")
+    full_name: Mapped[str] = mapped_column(String(255), nullable=False)
     
     # Authentication
-    hashed_password = Column(String(255), nullable=False)
-    reset_required = Column(Boolean, default=True, comment="Password reset required on first login")
-    password_reset_token = Column(String(255), nullable=True, comment="Password reset token")
-    password_reset_expiry = Column(DateTime, nullable=True, comment="Password reset token expiry")
+    # Deferred: only the password/reset flows read these; load them with undefer_group("auth_secrets")
+    hashed_password: Mapped[str] = mapped_column(String(255), nullable=False, deferred=True, deferred_group="auth_secrets")
+    reset_required: Mapped[Optional[bool]] = mapped_column(Boolean, default=True, comment="Password reset required on first login")
+    password_reset_token: Mapped[Optional[str]] = mapped_column(String(255), nullable=True, comment="Password reset token", deferred=True, deferred_group="auth_secrets")
+    password_reset_expiry: Mapped[Optional[datetime]] = mapped_column(DateTime, nullable=True, comment="Password reset token expiry", deferred=True, deferred_group="auth_secrets")
     
     # Hierarchy
-    manager_id = Column(Integer, ForeignKey("users.id", ondelete="SET NULL", onupdate="CASCADE"), nullable=True, comment="Self-referential")
+    manager_id: Mapped[Optional[int]] = mapped_column(Integer, ForeignKey("users.id", ondelete="SET NULL", onupdate="CASCADE"), nullable=True, comment="Self-referential")
+    # Denormalized lower-case name of the active role (NULL = none); kept in sync from user_roles in role.py
+    primary_role: Mapped[Optional[str]] = mapped_column(String(50), nullable=True, comment="Active role name, maintained from user_roles")
     
     # Employment
-    joining_date = Column(Date, nullable=True)
-    is_active = Column(Boolean, default=True)
-    employee_type = Column(String(50), default="Full-time")
+    joining_date: Mapped[Optional[date]] = mapped_column(Date, nullable=True)
+    is_active: Mapped[Optional[bool]] = mapped_column(Boolean, default=True)
+    employee_type: Mapped[Optional[str]] = mapped_column(String(50), default="Full-time")
     
     # Timestamps
-    created_at = Column(DateTime, default=datetime.utcnow, server_default=text("CURRENT_TIMESTAMP"))
-    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow, server_default=text("CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP"))
+    created_at: Mapped[Optional[datetime]] = mapped_column(DateTime, default=datetime.utcnow, server_default=text("CURRENT_TIMESTAMP"))
+    updated_at: Mapped[Optional[datetime]] = mapped_column(DateTime, default=datetime.utcnow, server_default=text("CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP"))
     
     # Relationships
-    manager = relationship("User", remote_side=[id], backref="subordinates")
+    manager = relationship("User", remote_side=[id], back_populates="subordinates")
+    subordinates = relationship("User", back_populates="manager")
     profile = relationship("UserProfile", back_populates="user", uselist=False, cascade="all, delete-orphan")
     staff_roles = relationship("StaffRole", back_populates="user", cascade="all, delete-orphan")
+    # Lazy on purpose: role checks read primary_role, so eager-loading roles would add a query to every User load
     user_roles = relationship("UserRole", foreign_keys="UserRole.user_id", back_populates="user", cascade="all, delete-orphan")
     leave_balances = relationship("UserLeaveBalance", back_populates="user", cascade="all, delete-orphan")
     leave_requests = relationship("LeaveRequestModel", foreign_keys="LeaveRequestModel.applicant_id", back_populates="applicant")
+    # Read-only, newest first; rows are managed through UserDocument directly
+    documents = relationship("UserDocument", order_by="desc(UserDocument.uploaded_at)", viewonly=True)
     
     __table_args__ = (
         Index("idx_email", "email"),
         Index("idx_employee_id", "employee_id"),
-        Index("idx_manager_id", "manager_id"),
-        Index("idx_is_active", "is_active"),
+        # Direct reports ordered by name are read straight from the index (InnoDB leaves also carry id)
+        Index("idx_manager_full_name", "manager_id", "full_name"),
+        # Active users by name (team lists); MySQL has no partial index on is_active alone
+        Index("idx_active_full_name", "is_active", "full_name"),
         Index("idx_created_at", "created_at"),
+        # reset-password looks users up by token; NULLs (no reset pending) do not collide in a MySQL unique index
+        Index("idx_password_reset_token", "password_reset_token", unique=True),
     )
 
 
+def load_user_full(stmt):
+    """
+    Add the eager loads every User -> UserSchema conversion needs (profile, balances, manager, documents)
+    to a select(User) statement. With SQLALCHEMY_RAISELOAD set, any other relationship access on the
+    loaded users raises instead of lazy-loading.
+    """
+    stmt = stmt.options(
+        selectinload(User.profile),
+        selectinload(User.leave_balances),
+        selectinload(User.manager),
+        selectinload(User.documents),
+    )
+    if RAISELOAD_GUARD:
+        stmt = stmt.options(raiseload("*"))
+    return stmt
+
+
 class UserDocument(Base):
     """User documents table"""
     __tablename__ = "user_documents"
     
-    id = Column(Integer, primary_key=True, autoincrement=True)
-    user_id = Column(Integer, ForeignKey("users.id", ondelete="CASCADE", onupdate="CASCADE"), nullable=False)
-    name = Column(String(255), nullable=False)
-    url = Column(String(500), nullable=False)
-    uploaded_at = Column(DateTime, default=datetime.utcnow, server_default=text("CURRENT_TIMESTAMP"))
+    id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
+    user_id: Mapped[int] = mapped_column(Integer, ForeignKey("users.id", ondelete="CASCADE", onupdate="CASCADE"), nullable=False)
+    name: Mapped[str] = mapped_column(String(255), nullable=False)
+    url: Mapped[str] = mapped_column(String(500), nullable=False)
+    uploaded_at: Mapped[Optional[datetime]] = mapped_column(DateTime, default=datetime.utcnow, server_default=text("CURRENT_TIMESTAMP"))
     
     __table_args__ = (
-        Index("idx_user_id", "user_id"),
+        Index("idx_user_documents_user_id", "user_id"),
         Index("idx_uploaded_at", "uploaded_at"),
     )
 
@@ -82,6 +115,19 @@ class UserRole(str, Enum):
     CONTRACT = "contract"
 
 
+# Built once at import: role validators do a dict lookup instead of scanning the enum per call
+_ROLE_MAP = {r.value: r for r in UserRole}
+_ROLE_VALUES = ", ".join(_ROLE_MAP)
+
+
+def _parse_role(v: str) -> UserRole:
+    """Case/whitespace-insensitive UserRole lookup; ValueError (-> 422) for unknown roles."""
+    role = _ROLE_MAP.get(v.lower().strip())
+    if role is None:
+        raise ValueError(f"Invalid role '{v}'. Must be one of: {_ROLE_VALUES}")
+    return role
+
+
 class UserBase(BaseModel):
     """Base user model"""
     employee_id: str
@@ -115,13 +161,7 @@ class UserCreateAdmin(BaseModel):
     def normalize_role(cls, v):
         """Convert role to lowercase and validate"""
         if isinstance(v, str):
-            v_lower = v.lower().strip()
-            # Try to find matching enum value
-            for role_enum in UserRole:
-                if role_enum.value == v_lower:
-                    return role_enum
-            # If not found, raise validation error
-            raise ValueError(f"Invalid role '{v}'. Must be one of: {', '.join([r.value for r in UserRole])}")
+            return _parse_role(v)
         return v
 
 
@@ -156,13 +196,7 @@ class UserUpdateAdmin(BaseModel):
         if v is None:
             return None
         if isinstance(v, str):
-            v_lower = v.lower().strip()
-            # Try to find matching enum value
-            for role_enum in UserRole:
-                if role_enum.value == v_lower:
-                    return role_enum
-            # If not found, raise validation error
-            raise ValueError(f"Invalid role '{v}'. Must be one of: {', '.join([r.value for r in UserRole])}")
+            return _parse_role(v)
         return v
 
 
@@ -191,32 +225,34 @@ class UserBalanceUpdate(BaseModel):
     sick_balance: Optional[float] = Field(None, ge=0, description="Sick leave balance")
     comp_off_balance: Optional[float] = Field(None, ge=0, description="Comp-off balance")
     wfh_balance: Optional[float] = Field(None, ge=0, description="WFH balance")
-    
-    class Config:
-        # Allow 0 values to be passed (they are valid)
-        # The ge=0 constraint will validate that values are >= 0
-        pass
+    # 0 is a valid value; the ge=0 constraints reject negatives
 
 
-class UserInDB(UserBase):
-    """User model with database fields"""
+@dataclass(slots=True, frozen=True)
+class UserInDB:
+    """
+    Credentials row for the login path: plain attribute holder built from a column select, so login
+    neither validates a Pydantic model nor builds a full ORM User for a password check.
+    """
     id: int
+    email: str
+    employee_id: str
+    full_name: str
     hashed_password: str
-    reset_required: bool
-    profile_picture_url: Optional[str] = None
-    created_at: Optional[datetime] = None
-    updated_at: Optional[datetime] = None
+    is_active: Optional[bool]
+    reset_required: Optional[bool]
+    primary_role: Optional[str]
+
 
-    class Config:
-        from_attributes = True
+# Columns to select for UserInDB(**row._mapping); explicitly selected deferred columns are loaded
+USER_IN_DB_COLUMNS = tuple(getattr(User, f.name) for f in fields(UserInDB))
 
 
 # Pydantic User model (exported as UserSchema to avoid overwriting SQLAlchemy User)
 class UserSchema(UserBase):
     """User model for API responses"""
     id: int
-    role: str = ""  # User's role (fetched from user_roles and roles tables)
-    hashed_password: str = ""  # Excluded from responses, set to empty for security
+    role: str = ""  # User's active role (users.primary_role)
     reset_required: bool = False
     profile_picture_url: Optional[str] = None
     dob: Optional[date] = None
@@ -245,8 +281,7 @@ class UserSchema(UserBase):
     # Documents (optional, fetched from user_documents table)
     documents: Optional[List[dict]] = None
 
-    class Config:
-        from_attributes = True
+    model_config = ConfigDict(from_attributes=True)
 
 # Note: SQLAlchemy User model is kept as User
 # Pydantic model is exported as UserSchema
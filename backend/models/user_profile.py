@@ -1,9 +1,12 @@
 """
 User profile table - 1:1 with users (profile, address, family, emergency contact).
+The long-tail family/emergency columns stay typed columns: in InnoDB's DYNAMIC row format a NULL costs one
+bit in the row's null bitmap and TEXT values live off-page, so sparse rows are already narrow.
 """
-from sqlalchemy import Column, Integer, String, Date, Text, DateTime, ForeignKey, Index, text  # type: ignore
-from sqlalchemy.orm import relationship  # type: ignore
+from sqlalchemy import Integer, String, Date, Text, DateTime, ForeignKey, Index, text  # type: ignore
+from sqlalchemy.orm import relationship, Mapped, mapped_column  # type: ignore
 from datetime import datetime, date
+from typing import Optional
 from backend.db import Base
 
 
@@ -11,33 +14,32 @@ class UserProfile(Base):
     """User profiles table - one row per user (1:1)."""
     __tablename__ = "user_profiles"
 
-    id = Column(Integer, primary_key=True, autoincrement=True)
-    user_id = Column(
+    id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
+    user_id: Mapped[int] = mapped_column(
         Integer,
         ForeignKey("users.id", ondelete="CASCADE", onupdate="CASCADE"),
         nullable=False,
         unique=True,
         comment="1:1 with users",
     )
-    profile_picture_url = Column(String(500), nullable=True)
-    dob = Column(Date, nullable=True)
-    blood_group = Column(String(10), nullable=True)
-    address = Column(Text, nullable=True, comment="Current address")
-    permanent_address = Column(Text, nullable=True, comment="Permanent address")
-    father_name = Column(String(255), nullable=True)
-    father_dob = Column(Date, nullable=True)
-    mother_name = Column(String(255), nullable=True)
-    mother_dob = Column(Date, nullable=True)
-    spouse_name = Column(String(255), nullable=True)
-    spouse_dob = Column(Date, nullable=True)
-    children_names = Column(Text, nullable=True, comment="Comma-separated or JSON array")
-    emergency_contact_name = Column(String(255), nullable=True)
-    emergency_contact_phone = Column(String(20), nullable=True)
-    created_at = Column(DateTime, default=datetime.utcnow, server_default=text("CURRENT_TIMESTAMP"))
-    updated_at = Column(
+    profile_picture_url: Mapped[Optional[str]] = mapped_column(String(500), nullable=True)
+    dob: Mapped[Optional[date]] = mapped_column(Date, nullable=True)
+    blood_group: Mapped[Optional[str]] = mapped_column(String(10), nullable=True)
+    address: Mapped[Optional[str]] = mapped_column(Text, nullable=True, comment="Current address")
+    permanent_address: Mapped[Optional[str]] = mapped_column(Text, nullable=True, comment="Permanent address")
+    father_name: Mapped[Optional[str]] = mapped_column(String(255), nullable=True)
+    father_dob: Mapped[Optional[date]] = mapped_column(Date, nullable=True)
+    mother_name: Mapped[Optional[str]] = mapped_column(String(255), nullable=True)
+    mother_dob: Mapped[Optional[date]] = mapped_column(Date, nullable=True)
+    spouse_name: Mapped[Optional[str]] = mapped_column(String(255), nullable=True)
+    spouse_dob: Mapped[Optional[date]] = mapped_column(Date, nullable=True)
+    children_names: Mapped[Optional[str]] = mapped_column(Text, nullable=True, comment="Comma-separated or JSON array")
+    emergency_contact_name: Mapped[Optional[str]] = mapped_column(String(255), nullable=True)
+    emergency_contact_phone: Mapped[Optional[str]] = mapped_column(String(20), nullable=True)
+    created_at: Mapped[Optional[datetime]] = mapped_column(DateTime, default=datetime.utcnow, server_default=text("CURRENT_TIMESTAMP"))
+    updated_at: Mapped[Optional[datetime]] = mapped_column(
         DateTime,
         default=datetime.utcnow,
-        onupdate=datetime.utcnow,
         server_default=text("CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP"),
     )
 
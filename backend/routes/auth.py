@@ -1,19 +1,24 @@
-from fastapi import APIRouter, HTTPException, Depends, status, Security, Request
+from fastapi import APIRouter, HTTPException, Depends, status, Security, Request, BackgroundTasks
 from pydantic import BaseModel
 from backend.db import get_db, AsyncSessionLocal
-from backend.services.audit import log_action as audit_log_action
+from backend.services.audit import log_action as audit_log_action, log_action_background as audit_log_action_background
 from backend.utils.action_log import log_user_action
-from backend.models import User as UserModel, UserRole as UserRoleModel, Role
-from backend.utils.security import verify_password, create_access_token, get_password_hash, SECRET_KEY, ALGORITHM
-from backend.models.user import UserInDB, UserRole
-from backend.utils.scopes import get_scopes_for_role, Scope, has_scope
-from jose import JWTError, jwt
+from backend.models import User as UserModel
+from backend.utils.security import (
+    verify_password_async, verify_and_update_password_async, verify_dummy_password_async, get_password_hash_async,
+    create_access_token, decode_access_token,
+)
+from backend.models.user import UserInDB, USER_IN_DB_COLUMNS, UserRole
+from backend.utils.scopes import get_scopes_for_role, Scope, has_scope, ADMIN_ROLES
+from jose import JWTError
 from fastapi.security import OAuth2PasswordBearer, SecurityScopes
-from sqlalchemy import select  # type: ignore
+from sqlalchemy import select, update  # type: ignore
 from sqlalchemy.ext.asyncio import AsyncSession  # type: ignore
+from sqlalchemy.orm import undefer_group  # type: ignore
 import os
 import secrets
 from datetime import datetime, timedelta
+from functools import lru_cache
 from typing import List, Tuple
 from backend.services.email import send_email
 
@@ -45,20 +50,24 @@ class ChangePasswordRequest(BaseModel):
     current_password: str
     new_password: str
 
-async def get_current_user_email(token: str = Depends(oauth2_scheme)):
-    credentials_exception = HTTPException(
+def _credentials_exception() -> HTTPException:
+    """401 for a missing/invalid token; built only on the failure path."""
+    return HTTPException(
         status_code=status.HTTP_401_UNAUTHORIZED,
         detail="Could not validate credentials",
         headers={"WWW-Authenticate": "Bearer"},
     )
+
+
+async def get_current_user_email(token: str = Depends(oauth2_scheme)):
     try:
-        payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
-        email: str | None = payload.get("sub")
-        if email is None:
-            raise credentials_exception
-        return email
+        payload = await decode_access_token(token)
     except JWTError:
-        raise credentials_exception
+        raise _credentials_exception()
+    email: str | None = payload.get("sub")
+    if email is None:
+        raise _credentials_exception()
+    return email
 
 
 async def get_optional_user_email(token: str | None = Depends(oauth2_scheme_optional)):
@@ -66,7 +75,7 @@ async def get_optional_user_email(token: str | None = Depends(oauth2_scheme_opti
     if token is None:
         return None
     try:
-        payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
+        payload = await decode_access_token(token)
         return payload.get("sub")
     except JWTError:
         return None
@@ -75,39 +84,43 @@ async def get_optional_user_email(token: str | None = Depends(oauth2_scheme_opti
 def create_scope_dependency(required_scopes: List[str]):
     """
     Create a dependency function that requires specific scopes.
+    The same scope set (in any order) always yields the same function, so FastAPI's per-request
+    dependency cache runs the check once even when several dependencies in a request tree use it.
     
     Usage:
         @router.get("/endpoint")
         async def my_endpoint(email: str = Depends(create_scope_dependency([Scope.ADMIN_USERS]))):
             ...
     """
+    return _scope_dependency(tuple(sorted(set(required_scopes))))
+
+
+# One entry per distinct scope set declared on a route; all created at import time
+@lru_cache(maxsize=None)
+def _scope_dependency(required_scopes: Tuple[str, ...]):
+    # Built once per dependency, not per request
+    required = frozenset(required_scopes)
+    www_authenticate = f'Bearer scope="{" ".join(required_scopes)}"'
+    forbidden_detail = f"Not enough permissions. Required scopes: {', '.join(required_scopes)}"
+
     async def scope_checker(token: str = Depends(oauth2_scheme)):
-        credentials_exception = HTTPException(
-            status_code=status.HTTP_401_UNAUTHORIZED,
-            detail="Could not validate credentials",
-            headers={"WWW-Authenticate": "Bearer"},
-        )
-        
         try:
-            payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
-            email: str | None = payload.get("sub")
-            scopes: List[str] = payload.get("scopes", [])  # type: ignore
-            
-            if email is None:
-                raise credentials_exception
-            
-            # Check if token has required scopes (any of them)
-            if required_scopes and not any(scope in scopes for scope in required_scopes):
-                missing_scopes = [s for s in required_scopes if s not in scopes]
-                raise HTTPException(
-                    status_code=status.HTTP_403_FORBIDDEN,
-                    detail=f"Not enough permissions. Required scopes: {', '.join(required_scopes)}",
-                    headers={"WWW-Authenticate": f'Bearer scope="{" ".join(required_scopes)}"'},
-                )
-            
-            return email
+            payload = await decode_access_token(token)
         except JWTError:
-            raise credentials_exception
+            raise _credentials_exception()
+        email: str | None = payload.get("sub")
+        if email is None:
+            raise _credentials_exception()
+        
+        # Check if token has required scopes (any of them); one hash probe per granted scope
+        if required and required.isdisjoint(payload.get("scopes", ())):
+            raise HTTPException(
+                status_code=status.HTTP_403_FORBIDDEN,
+                detail=forbidden_detail,
+                headers={"WWW-Authenticate": www_authenticate},
+            )
+        
+        return email
     
     return scope_checker
 
@@ -120,21 +133,11 @@ async def verify_admin(email: str = Depends(get_current_user_email), db: AsyncSe
     if not user:
         raise HTTPException(status_code=404, detail="User not found")
     
-    # Get user's active role
-    result = await db.execute(
-        select(UserRoleModel, Role)
-        .join(Role, UserRoleModel.role_id == Role.id)
-        .where(UserRoleModel.user_id == user.id, UserRoleModel.is_active == True)
-    )
-    user_role_record = result.first()
-    
-    if not user_role_record:
+    # Active role, kept denormalized on users.primary_role
+    role_name = user.primary_role
+    if not role_name:
         raise HTTPException(status_code=403, detail="User has no active role assigned")
-    
-    # When selecting multiple models, result.first() returns a tuple
-    role_name = user_role_record[1].name  # user_role_record[0] is UserRoleModel, [1] is Role
-    allowed_roles = [UserRole.ADMIN.value, UserRole.FOUNDER.value, UserRole.CO_FOUNDER.value, UserRole.HR.value]
-    if role_name.lower() not in allowed_roles:
+    if role_name not in ADMIN_ROLES:
         raise HTTPException(status_code=403, detail="Admin/HR access required")
     
     # Return user dict for backward compatibility
@@ -146,7 +149,6 @@ async def verify_admin(email: str = Depends(get_current_user_email), db: AsyncSe
         "employee_id": user.employee_id,
         "is_active": user.is_active,
         "reset_required": user.reset_required,
-        "hashed_password": user.hashed_password,
         "manager_id": user.manager_id,
     }
 
@@ -157,33 +159,32 @@ async def login(
     db: AsyncSession = Depends(get_db),
 ):
     try:
-        # Get user by email
-        result = await db.execute(select(UserModel).where(UserModel.email == form_data.username))
-        user = result.scalar_one_or_none()
-        if not user:
+        # Get user by email: only the columns login uses, no ORM identity-map entry
+        result = await db.execute(select(*USER_IN_DB_COLUMNS).where(UserModel.email == form_data.username))
+        row = result.one_or_none()
+        if not row:
+            # Same hashing cost as a wrong password, so unknown emails are not distinguishable by timing
+            await verify_dummy_password_async(form_data.password)
             raise HTTPException(status_code=400, detail="Incorrect email or password")
+        user = UserInDB(**row._mapping)
         
         # Verify password
-        if not verify_password(form_data.password, user.hashed_password):
+        verified, new_hash = await verify_and_update_password_async(form_data.password, user.hashed_password)
+        if not verified:
             raise HTTPException(status_code=400, detail="Incorrect email or password")
+        if new_hash:
+            # Migrate a bcrypt (or outdated Argon2) hash
+            await db.execute(update(UserModel).where(UserModel.id == user.id).values(hashed_password=new_hash))
+            await db.commit()
         
         # Check if active
         if not user.is_active:
             raise HTTPException(status_code=400, detail="User is inactive")
 
-        # Get user's active role
-        result = await db.execute(
-            select(UserRoleModel, Role)
-            .join(Role, UserRoleModel.role_id == Role.id)
-            .where(UserRoleModel.user_id == user.id, UserRoleModel.is_active == True)
-        )
-        user_role_record = result.first()
-        
-        if not user_role_record:
+        # Active role, kept denormalized on users.primary_role
+        role_name = user.primary_role
+        if not role_name:
             raise HTTPException(status_code=403, detail="User has no active role assigned")
-        
-        # When selecting multiple models, result.first() returns a tuple
-        role_name = user_role_record[1].name  # user_role_record[0] is UserRoleModel, [1] is Role
         try:
             user_role = UserRole(role_name.lower())  # Convert to lowercase to match enum values
         except ValueError:
@@ -208,7 +209,8 @@ async def login(
         
         if requested_scopes:
             # Only grant scopes that user's role allows
-            granted_scopes = [s for s in default_scopes if s in requested_scopes]
+            requested = set(requested_scopes)
+            granted_scopes = [s for s in default_scopes if s in requested]
         
         # Create token with both role (for backward compatibility) and scopes
         token_data = {
@@ -218,8 +220,8 @@ async def login(
         }
         access_token = create_access_token(data=token_data)
 
-        await audit_log_action(
-            db,
+        # Login itself writes nothing, so the audit entry is queued and written in a batch after the response
+        audit_log_action_background(
             "LOGIN",
             "USER",
             user_id=user.id,
@@ -269,7 +271,7 @@ async def first_login_reset(
     if not user.reset_required:
          raise HTTPException(status_code=400, detail="Password reset not required for this user")
 
-    hashed_password = get_password_hash(reset_data.new_password)
+    hashed_password = await get_password_hash_async(reset_data.new_password)
     user.hashed_password = hashed_password
     user.reset_required = False
     await audit_log_action(
@@ -293,6 +295,7 @@ async def first_login_reset(
 async def forgot_password(
     request_body: ForgotPasswordRequest,
     request: Request,
+    background_tasks: BackgroundTasks,
     db: AsyncSession = Depends(get_db),
 ):
     result = await db.execute(select(UserModel).where(UserModel.email == request_body.email))
@@ -319,8 +322,9 @@ async def forgot_password(
     frontend_url = os.getenv("FRONTEND_URL", "http://localhost:3000")
     reset_link = f"{frontend_url}/reset-password?token={token}"
     
-    # Send Email
-    await send_email(
+    # Send Email after the response; the token is already committed
+    background_tasks.add_task(
+        send_email,
         to_email=request_body.email,
         subject="Reset Password",
         body=f"Target: {request_body.email}\nYour reset token is: {token}\n\nClick here to reset your password:\n{reset_link}\n\nExpires in 15 minutes."
@@ -334,29 +338,39 @@ async def reset_password_token(
     request: Request,
     db: AsyncSession = Depends(get_db),
 ):
-    # Find user with matching token and non-expired expiry
+    # Lock the matching row: a concurrent request with the same token waits here and then finds it consumed,
+    # so a token can only be used once
     result = await db.execute(
-        select(UserModel).where(
+        select(UserModel.id)
+        .where(
             UserModel.password_reset_token == request_body.token,
             UserModel.password_reset_expiry > datetime.utcnow()
         )
+        .with_for_update()
     )
-    user = result.scalar_one_or_none()
-    
-    if not user:
+    user_id = result.scalar_one_or_none()
+    if user_id is None:
         raise HTTPException(status_code=400, detail="Invalid or expired token")
-        
-    hashed_password = get_password_hash(request_body.new_password)
-    user.hashed_password = hashed_password
-    user.reset_required = False
-    user.password_reset_token = None
-    user.password_reset_expiry = None
+    # Hash only for a valid token: Argon2 (64 MiB) per unauthenticated request with a random token would be a
+    # cheap way to exhaust memory and the threadpool. Nothing is written yet, so a failure here leaves the token unused.
+    hashed_password = await get_password_hash_async(request_body.new_password)
+    await db.execute(
+        update(UserModel)
+        .where(UserModel.id == user_id)
+        .values(
+            hashed_password=hashed_password,
+            reset_required=False,
+            password_reset_token=None,
+            password_reset_expiry=None,
+        )
+        .execution_options(synchronize_session=False)
+    )
     await audit_log_action(
         db,
         "RESET_PASSWORD_TOKEN",
         "USER",
-        user_id=user.id,
-        affected_entity_id=user.id,
+        user_id=user_id,
+        affected_entity_id=user_id,
     )
     await db.commit()
     
@@ -369,16 +383,18 @@ async def change_password(
     email: str = Depends(get_current_user_email),
     db: AsyncSession = Depends(get_db),
 ):
-    result = await db.execute(select(UserModel).where(UserModel.email == email))
+    result = await db.execute(
+        select(UserModel).where(UserModel.email == email).options(undefer_group("auth_secrets"))
+    )
     user = result.scalar_one_or_none()
     if not user:
         raise HTTPException(status_code=404, detail="User not found")
         
     # Verify current password
-    if not verify_password(request_body.current_password, user.hashed_password):
+    if not await verify_password_async(request_body.current_password, user.hashed_password):
         raise HTTPException(status_code=400, detail="Incorrect current password")
         
-    hashed_password = get_password_hash(request_body.new_password)
+    hashed_password = await get_password_hash_async(request_body.new_password)
     user.hashed_password = hashed_password
     await audit_log_action(
         db,
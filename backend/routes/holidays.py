@@ -1,15 +1,18 @@
 from fastapi import APIRouter, HTTPException, Depends, Response, Request, status
-from typing import List
+from typing import List, Optional, Tuple
+from pydantic import TypeAdapter
 from backend.db import get_db, AsyncSessionLocal
 from backend.services.audit import log_action as audit_log_action
 from backend.utils.action_log import log_user_action
 from backend.models import Holiday as HolidayModel, JobLog as JobLogModel, JobStatusEnum
 from backend.models.leave import Holiday, HolidayCreate
+from backend.middleware.etag import etag_matches
 from backend.models.user import UserRole
 from backend.routes.auth import get_current_user_email, verify_admin
 from backend.routes.users import get_current_user
 from backend.models.user import User
-from sqlalchemy import select, and_  # type: ignore
+from sqlalchemy import insert, select, or_, func  # type: ignore
+from sqlalchemy.exc import IntegrityError  # type: ignore
 from sqlalchemy.ext.asyncio import AsyncSession  # type: ignore
 from backend.utils.id_utils import to_int_id
 from datetime import datetime
@@ -20,6 +23,20 @@ router = APIRouter(prefix="/admin", tags=["Holidays"])
 
 calendar_router = APIRouter(prefix="/calendar", tags=["Calendar"])
 
+# Serializes the whole holiday list in one call into pydantic-core (no per-item Python validation/encoding)
+_HOLIDAY_LIST_ADAPTER = TypeAdapter(List[Holiday])
+# Rows per INSERT statement in bulk imports
+_BULK_INSERT_CHUNK = 1000
+# Exactly the fields of the Holiday response model
+_HOLIDAY_COLUMNS = (HolidayModel.id, HolidayModel.name, HolidayModel.date, HolidayModel.year, HolidayModel.is_optional)
+
+
+def _actor(admin):
+    """(id, email, full_name, employee_id) of the verify_admin result (a dict) or a user object."""
+    get = admin.get if isinstance(admin, dict) else (lambda key: getattr(admin, key, None))
+    return get("id"), get("email"), get("full_name"), get("employee_id")
+
+
 @router.post("/holidays/bulk", response_model=dict)
 async def bulk_create_holidays(
     request: Request,
@@ -30,30 +47,54 @@ async def bulk_create_holidays(
     """
     Bulk import holidays. Skips duplicates based on date.
     """
-    inserted_count = 0
     errors = []
     
+    # One IN query for every date in the payload instead of a SELECT per holiday
+    result = await db.execute(
+        select(HolidayModel.date).where(HolidayModel.date.in_({h.date for h in holidays}))
+    )
+    existing_dates = set(result.scalars())
+    rows = []
     for h in holidays:
-        # Check if exists
-        result = await db.execute(select(HolidayModel).where(HolidayModel.date == h.date))
-        existing = result.scalar_one_or_none()
-        if existing:
+        if h.date in existing_dates:
             errors.append(f"Date {h.date} already exists")
             continue
-            
-        new_holiday = HolidayModel(
-            date=h.date,
-            name=h.name,
-            year=h.date.year,
-            is_optional=getattr(h, 'is_optional', False)
-        )
-        db.add(new_holiday)
-        inserted_count += 1
+        # Later entries with the same date in this payload count as duplicates too
+        existing_dates.add(h.date)
+        rows.append({
+            "date": h.date,
+            "name": h.name,
+            "year": h.date.year,
+            "is_optional": getattr(h, 'is_optional', False),
+        })
+    # Multi-row INSERTs (ORM add_all would issue one INSERT per row to read back each id), in chunks so a
+    # very large import stays well inside max_allowed_packet. Each chunk runs in a savepoint: if a date was
+    # inserted concurrently since the check above, the unique key rejects the chunk, those dates are reported
+    # as duplicates and the rest of the chunk is inserted again, so count and errors match what was written.
+    inserted_count = 0
+    for start in range(0, len(rows), _BULK_INSERT_CHUNK):
+        chunk = rows[start:start + _BULK_INSERT_CHUNK]
+        while chunk:
+            try:
+                async with db.begin_nested():
+                    await db.execute(insert(HolidayModel).values(chunk))
+            except IntegrityError:
+                # Locking read: a plain SELECT would see this transaction's snapshot, not the rows that collided
+                result = await db.execute(
+                    select(HolidayModel.date)
+                    .where(HolidayModel.date.in_([row["date"] for row in chunk]))
+                    .with_for_update(read=True)
+                )
+                taken = set(result.scalars())
+                if not taken:
+                    raise
+                errors.extend(f"Date {row['date']} already exists" for row in chunk if row["date"] in taken)
+                chunk = [row for row in chunk if row["date"] not in taken]
+                continue
+            inserted_count += len(chunk)
+            break
 
-    admin_id = admin.get("id") if isinstance(admin, dict) else getattr(admin, "id", None)
-    admin_email = admin.get("email") if isinstance(admin, dict) else getattr(admin, "email", None)
-    admin_name = admin.get("full_name") if isinstance(admin, dict) else getattr(admin, "full_name", None)
-    admin_emp_id = admin.get("employee_id") if isinstance(admin, dict) else getattr(admin, "employee_id", None)
+    admin_id, admin_email, admin_name, admin_emp_id = _actor(admin)
     await audit_log_action(
         db,
         "BULK_CREATE_HOLIDAYS",
@@ -68,9 +109,6 @@ async def bulk_create_holidays(
         request_path=request.url.path,
     )
     await db.commit()
-    admin_email = admin.get("email") if isinstance(admin, dict) else getattr(admin, "email", None)
-    admin_name = admin.get("full_name") if isinstance(admin, dict) else getattr(admin, "full_name", None)
-    admin_emp_id = admin.get("employee_id") if isinstance(admin, dict) else getattr(admin, "employee_id", None)
     log_user_action(
         "BULK_CREATE_HOLIDAYS",
         user_id=admin_id,
@@ -94,12 +132,6 @@ async def create_holiday(
     admin=Depends(verify_admin),
     db: AsyncSession = Depends(get_db),
 ):
-    # Check if exists
-    result = await db.execute(select(HolidayModel).where(HolidayModel.date == holiday.date))
-    existing = result.scalar_one_or_none()
-    if existing:
-        raise HTTPException(status_code=400, detail="Holiday for this date already exists")
-    
     new_holiday = HolidayModel(
         date=holiday.date,
         name=holiday.name,
@@ -107,12 +139,14 @@ async def create_holiday(
         is_optional=False
     )
     db.add(new_holiday)
-    await db.flush()
+    # holidays.date is unique: the INSERT itself is the duplicate check (no pre-SELECT, no race)
+    try:
+        await db.flush()
+    except IntegrityError:
+        await db.rollback()
+        raise HTTPException(status_code=400, detail="Holiday for this date already exists")
     holiday_id = new_holiday.id
-    admin_id = admin.get("id") if isinstance(admin, dict) else getattr(admin, "id", None)
-    admin_email = admin.get("email") if isinstance(admin, dict) else getattr(admin, "email", None)
-    admin_name = admin.get("full_name") if isinstance(admin, dict) else getattr(admin, "full_name", None)
-    admin_emp_id = admin.get("employee_id") if isinstance(admin, dict) else getattr(admin, "employee_id", None)
+    admin_id, admin_email, admin_name, admin_emp_id = _actor(admin)
     await audit_log_action(
         db,
         "CREATE_HOLIDAY",
@@ -128,9 +162,6 @@ async def create_holiday(
         request_path=request.url.path,
     )
     await db.commit()
-    admin_email = admin.get("email") if isinstance(admin, dict) else getattr(admin, "email", None)
-    admin_name = admin.get("full_name") if isinstance(admin, dict) else getattr(admin, "full_name", None)
-    admin_emp_id = admin.get("employee_id") if isinstance(admin, dict) else getattr(admin, "employee_id", None)
     log_user_action(
         "CREATE_HOLIDAY",
         user_id=admin_id,
@@ -159,10 +190,7 @@ async def delete_holiday(
     if not holiday:
         raise HTTPException(status_code=404, detail="Holiday not found")
 
-    admin_id = admin.get("id") if isinstance(admin, dict) else getattr(admin, "id", None)
-    admin_email = admin.get("email") if isinstance(admin, dict) else getattr(admin, "email", None)
-    admin_name = admin.get("full_name") if isinstance(admin, dict) else getattr(admin, "full_name", None)
-    admin_emp_id = admin.get("employee_id") if isinstance(admin, dict) else getattr(admin, "employee_id", None)
+    admin_id, admin_email, admin_name, admin_emp_id = _actor(admin)
     await audit_log_action(
         db,
         "DELETE_HOLIDAY",
@@ -179,9 +207,6 @@ async def delete_holiday(
     )
     await db.delete(holiday)
     await db.commit()
-    admin_email = admin.get("email") if isinstance(admin, dict) else getattr(admin, "email", None)
-    admin_name = admin.get("full_name") if isinstance(admin, dict) else getattr(admin, "full_name", None)
-    admin_emp_id = admin.get("employee_id") if isinstance(admin, dict) else getattr(admin, "employee_id", None)
     log_user_action(
         "DELETE_HOLIDAY",
         user_id=admin_id,
@@ -210,19 +235,18 @@ async def run_yearly_reset(
     yearly_scheduler_name = f"yearly_reset_{current_year}"
     yearly_manual_prefix = f"manual_yearly_reset_{current_year}_"
 
-    # Lockout: only allow if yearly reset has not run for this year (scheduler or manual)
-    scheduler_run = await db.execute(
-        select(JobLogModel).where(
-            and_(JobLogModel.job_name == yearly_scheduler_name, JobLogModel.status == JobStatusEnum.SUCCESS)
-        )
-    )
-    manual_run = await db.execute(
-        select(JobLogModel).where(
-            JobLogModel.job_name.like(f"{yearly_manual_prefix}%"),
+    # Lockout: only allow if yearly reset has not run for this year (scheduler or manual). One query:
+    # both name conditions are ranges on idx_job_status (job_name, status), which also covers status
+    already_run = await db.execute(
+        select(JobLogModel.id).where(
+            or_(
+                JobLogModel.job_name == yearly_scheduler_name,
+                JobLogModel.job_name.like(f"{yearly_manual_prefix}%"),
+            ),
             JobLogModel.status == JobStatusEnum.SUCCESS,
         ).limit(1)
     )
-    if scheduler_run.scalar_one_or_none() or manual_run.scalar_one_or_none():
+    if already_run.scalar() is not None:
         raise HTTPException(
             status_code=status.HTTP_409_CONFLICT,
             detail=f"Yearly reset has already run for {current_year}. Use only when the automatic run (Jan 1) did not happen.",
@@ -253,10 +277,7 @@ async def run_yearly_reset(
             }
         )
         db.add(job_log)
-        admin_id = current_user.get("id") if isinstance(current_user, dict) else getattr(current_user, "id", None)
-        admin_email = current_user.get("email") if isinstance(current_user, dict) else getattr(current_user, "email", None)
-        admin_name = current_user.get("full_name") if isinstance(current_user, dict) else getattr(current_user, "full_name", None)
-        admin_emp_id = current_user.get("employee_id") if isinstance(current_user, dict) else getattr(current_user, "employee_id", None)
+        admin_id, admin_email, admin_name, admin_emp_id = _actor(current_user)
         await audit_log_action(
             db,
             "YEARLY_RESET",
@@ -271,9 +292,6 @@ async def run_yearly_reset(
             request_path=request.url.path,
         )
         await db.commit()
-        admin_email = current_user.get("email") if isinstance(current_user, dict) else getattr(current_user, "email", None)
-        admin_name = current_user.get("full_name") if isinstance(current_user, dict) else getattr(current_user, "full_name", None)
-        admin_emp_id = current_user.get("employee_id") if isinstance(current_user, dict) else getattr(current_user, "employee_id", None)
         log_user_action(
             "YEARLY_RESET",
             user_id=admin_id,
@@ -301,29 +319,56 @@ async def run_yearly_reset(
         await db.commit()
         raise HTTPException(status_code=500, detail=f"Job failed: {str(e)}")
 
+_HOLIDAYS_CACHE_CONTROL = "public, max-age=60, must-revalidate"
+
+# Last serialized holiday list and the ETag it was built for. Keyed by the table version, so a write made
+# through any worker is seen on the next request without explicit invalidation; concurrent misses each
+# rebuild the (small) list and the last one stored wins.
+_holidays_body_cache: Optional[Tuple[str, bytes]] = None
+
+
+async def _holidays_etag(db: AsyncSession) -> str:
+    """
+    Version tag of the holidays table from COUNT(*) and MAX(id) (one primary-key scan).
+    Holidays are only ever inserted or deleted, never updated in place, and AUTO_INCREMENT ids are not
+    reused, so any change moves one of the two - consistently across workers, unlike an in-process counter.
+    """
+    result = await db.execute(select(func.count(), func.coalesce(func.max(HolidayModel.id), 0)))
+    count, max_id = result.one()
+    return f'W/"holidays-{count}-{max_id}"'
+
+
 @calendar_router.get("/holidays", response_model=List[Holiday])
 async def get_holidays(
-    response: Response,
+    request: Request,
     current_user: User = Depends(get_current_user),
     db: AsyncSession = Depends(get_db)
 ):
     """
     Get all holidays with HTTP caching for static data.
+    A revalidation whose If-None-Match still matches gets a 304 without the rows being read.
     """
-    # Sort by date for calendar convenience
-    result = await db.execute(select(HolidayModel).order_by(HolidayModel.date))
-    holidays_models = result.scalars().all()
-    
-    holidays = []
-    for h in holidays_models:
-        holidays.append(Holiday(
-            id=h.id,
-            date=h.date,
-            name=h.name,
-            year=h.year,
-            is_optional=h.is_optional
-        ))
+    etag = await _holidays_etag(db)
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match is not None and etag_matches(if_none_match.encode("latin-1"), etag.encode("ascii")):
+        return Response(status_code=304, headers={"ETag": etag, "Cache-Control": _HOLIDAYS_CACHE_CONTROL})
+
+    global _holidays_body_cache
+    cached = _holidays_body_cache
+    if cached is not None and cached[0] == etag:
+        body = cached[1]
+    else:
+        # Sort by date for calendar convenience. Plain column rows, no ORM instances or identity map;
+        # pydantic reads the row attributes directly (from_attributes)
+        result = await db.execute(select(*_HOLIDAY_COLUMNS).order_by(HolidayModel.date))
+        holidays = _HOLIDAY_LIST_ADAPTER.validate_python(result.all(), from_attributes=True)
+        body = _HOLIDAY_LIST_ADAPTER.dump_json(holidays)
+        _holidays_body_cache = (etag, body)
     
-    # Set cache headers with shorter max-age and must-revalidate to allow fresh data after uploads
-    response.headers["Cache-Control"] = "public, max-age=60, must-revalidate"
-    return holidays
+    # Set cache headers with shorter max-age and must-revalidate to allow fresh data after uploads.
+    # ETagMiddleware leaves responses that already carry an ETag alone.
+    return Response(
+        content=body,
+        media_type="application/json",
+        headers={"Cache-Control": _HOLIDAYS_CACHE_CONTROL, "ETag": etag},
+    )
@@ -14,11 +14,10 @@ from backend.models.leave import (
     LeaveRequestCreate, LeaveStatus, LeaveType, 
     CompOffClaimCreate, CompOffStatus
 )
-from backend.models.user import UserRole
 from backend.models import UserSchema
 from backend.routes.auth import get_current_user_email, verify_admin, create_scope_dependency
 from backend.routes.users import user_model_to_pydantic
-from backend.utils.scopes import Scope
+from backend.utils.scopes import Scope, ADMIN_ROLES
 from backend.services.email import send_email
 from backend.services.audit import log_action as audit_log_action
 from backend.utils.action_log import log_user_action
@@ -391,15 +390,9 @@ async def action_leave(
         is_assigned_manager = (item.approver_id == approver.id)
     
     # Rule 2: God Mode (Admin, Founder, HR) - check via role
-    # Get user's role from user_roles table
-    from backend.models import UserRole as UserRoleModel, Role
-    role_result = await db.execute(
-        select(Role.name)
-        .join(UserRoleModel, Role.id == UserRoleModel.role_id)
-        .where(and_(UserRoleModel.user_id == approver.id, UserRoleModel.is_active == True))
-    )
-    role_name = role_result.scalar_one_or_none()
-    is_super_approver = role_name in [UserRole.ADMIN.value, UserRole.FOUNDER.value, UserRole.CO_FOUNDER.value, UserRole.HR.value] if role_name else False
+    # approver.role is users.primary_role, already loaded with the approver row
+    role_name = approver.role
+    is_super_approver = role_name in ADMIN_ROLES
     
     if not (is_assigned_manager or is_super_approver):
          raise HTTPException(status_code=403, detail="You are not authorized to approve this request")
@@ -725,15 +718,9 @@ async def cancel_leave(
 
 @router.get("/pending", response_model=dict)
 async def get_pending_requests(user: UserSchema = Depends(get_current_user), db: AsyncSession = Depends(get_db)):
-    # Get user's role to check if they're admin/HR/founder
-    from backend.models import UserRole as UserRoleModel, Role
-    role_result = await db.execute(
-        select(Role.name)
-        .join(UserRoleModel, Role.id == UserRoleModel.role_id)
-        .where(and_(UserRoleModel.user_id == user.id, UserRoleModel.is_active == True))
-    )
-    role_name = role_result.scalar_one_or_none()
-    is_god_mode = role_name in [UserRole.ADMIN.value, UserRole.HR.value, UserRole.FOUNDER.value, UserRole.CO_FOUNDER.value] if role_name else False
+    # Get user's role to check if they're admin/HR/founder (users.primary_role, via get_current_user)
+    role_name = user.role
+    is_god_mode = role_name in ADMIN_ROLES
     
     # LEAVES QUERY
     leave_query = select(LeaveRequestModel).where(LeaveRequestModel.status == LeaveStatusEnum.PENDING)
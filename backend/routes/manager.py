@@ -7,17 +7,20 @@ from datetime import date
 from typing import List, Optional
 
 from backend.db import get_db
-from backend.models import User as UserModel, UserRole as UserRoleModel, Role, LeaveRequest as LeaveRequestModel
+from backend.models import User as UserModel, LeaveRequest as LeaveRequestModel
 from backend.models.enums import LeaveStatusEnum
 from backend.models.user import UserRole
+from backend.utils.scopes import ADMIN_ROLES
 from backend.routes.auth import get_current_user_email
 from backend.routes.users import get_current_user, user_model_to_pydantic
-from sqlalchemy import select, and_  # type: ignore
+from sqlalchemy import select  # type: ignore
 from sqlalchemy.ext.asyncio import AsyncSession  # type: ignore
 from sqlalchemy.orm import selectinload  # type: ignore
 
 router = APIRouter(prefix="/manager", tags=["Manager view"])
 
+_MANAGER_OR_ABOVE = ADMIN_ROLES | {UserRole.MANAGER.value}
+
 
 async def verify_manager_or_above(
     email: str = Depends(get_current_user_email),
@@ -28,17 +31,10 @@ async def verify_manager_or_above(
     user = result.scalar_one_or_none()
     if not user:
         raise HTTPException(status_code=404, detail="User not found")
-    result = await db.execute(
-        select(UserRoleModel, Role)
-        .join(Role, UserRoleModel.role_id == Role.id)
-        .where(UserRoleModel.user_id == user.id, UserRoleModel.is_active == True)
-    )
-    user_role_record = result.first()
-    if not user_role_record:
+    role_name = user.primary_role
+    if not role_name:
         raise HTTPException(status_code=403, detail="No active role assigned")
-    role_name = user_role_record[1].name
-    allowed = [UserRole.MANAGER.value, UserRole.HR.value, UserRole.FOUNDER.value, UserRole.CO_FOUNDER.value, UserRole.ADMIN.value]
-    if role_name.lower() not in allowed:
+    if role_name not in _MANAGER_OR_ABOVE:
         raise HTTPException(status_code=403, detail="Manager or above access required")
     return user
 
@@ -51,7 +47,7 @@ def _team_query(current_user: UserModel, role_name: str):
         .order_by(UserModel.full_name)
         .options(selectinload(UserModel.profile))
     )
-    if role_name.lower() not in ("hr", "admin", "founder", "co_founder"):
+    if role_name not in ADMIN_ROLES:
         q = q.where(UserModel.manager_id == current_user.id)
     return q
 
@@ -64,13 +60,7 @@ async def get_my_team(
     """
     List team members: HR/admin/founder see all active users; manager sees only direct reports.
     """
-    result = await db.execute(
-        select(UserRoleModel, Role)
-        .join(Role, UserRoleModel.role_id == Role.id)
-        .where(UserRoleModel.user_id == manager_user.id, UserRoleModel.is_active == True)
-    )
-    role_record = result.first()
-    role_name = role_record[1].name if role_record else "manager"
+    role_name = manager_user.primary_role or "manager"
     query = _team_query(manager_user, role_name)
     result = await db.execute(query)
     reports = result.scalars().all()
@@ -134,13 +124,7 @@ async def get_team_presence(
     status: "present" = not on approved leave that day; "on_leave" = on approved leave.
     """
     target_date = date_param or date.today()
-    result = await db.execute(
-        select(UserRoleModel, Role)
-        .join(Role, UserRoleModel.role_id == Role.id)
-        .where(UserRoleModel.user_id == manager_user.id, UserRoleModel.is_active == True)
-    )
-    role_record = result.first()
-    role_name = role_record[1].name if role_record else "manager"
+    role_name = manager_user.primary_role or "manager"
     query = _team_query(manager_user, role_name)
     result = await db.execute(query)
     reports = result.scalars().all()
@@ -3,17 +3,20 @@ from fastapi import APIRouter, HTTPException, Depends, status, UploadFile, File,
 import shutil
 import os
 from pathlib import Path
+from uuid import uuid4
 from backend.db import get_db, AsyncSessionLocal
 from backend.models import (
     Policy, PolicyDocument as PolicyDocumentModel, PolicyAcknowledgment,
-    User as UserModel, UserRole as UserRoleModel, Role
+    User as UserModel
 )
 from sqlalchemy import select, and_, func  # type: ignore
 from sqlalchemy.orm import selectinload  # type: ignore
-from backend.models.policy import LeavePolicy, PolicyDocumentSchema as PolicyDocument, DocumentsByYearItem
+from sqlalchemy.dialects.mysql import insert as mysql_insert  # type: ignore
+from backend.models.policy import LeavePolicy, PolicyDocumentSchema as PolicyDocument, DocumentsByYearItem, load_policy_full
 from backend.routes.users import get_current_user, user_model_to_pydantic
 from backend.routes.auth import get_current_user_email
-from backend.models.user import UserSchema as User, UserRole
+from backend.models.user import UserSchema as User
+from backend.utils.scopes import ADMIN_ROLES
 from typing import List, Optional
 from datetime import datetime
 from sqlalchemy.ext.asyncio import AsyncSession  # type: ignore
@@ -57,7 +60,7 @@ async def get_current_user_safe(email: str = Depends(get_current_user_email), db
 
 # Helper to verify admin
 async def verify_admin(current_user: User = Depends(get_current_user_safe), db: AsyncSession = Depends(get_db)):
-    """Verify user has admin/HR/founder role by querying user_roles table."""
+    """Verify user has admin/HR/founder role (users.primary_role, mirrored from user_roles)."""
     try:
         # Ensure we have a valid user object
         if not current_user:
@@ -83,24 +86,15 @@ async def verify_admin(current_user: User = Depends(get_current_user_safe), db:
                 detail="Invalid user ID"
             )
         
-        # Get user's role from user_roles table using SQLAlchemy
-        result = await db.execute(
-            select(UserRoleModel, Role)
-            .join(Role, UserRoleModel.role_id == Role.id)
-            .where(and_(UserRoleModel.user_id == user_id_int, UserRoleModel.is_active == True))
-        )
-        user_role_record = result.first()
-        
-        if not user_role_record:
+        # current_user.role is users.primary_role, loaded with the user row by get_current_user_safe
+        user_role_name = current_user.role
+        if not user_role_name:
             raise HTTPException(
                 status_code=status.HTTP_403_FORBIDDEN,
                 detail="No active role found for user"
             )
         
-        # When selecting multiple models, result.first() returns a tuple
-        user_role_name = user_role_record[1].name  # user_role_record[0] is UserRoleModel, [1] is Role
-        allowed_roles = [UserRole.ADMIN.value.lower(), UserRole.FOUNDER.value.lower(), UserRole.CO_FOUNDER.value.lower(), UserRole.HR.value.lower()]
-        if user_role_name.lower() not in allowed_roles:
+        if user_role_name not in ADMIN_ROLES:
             raise HTTPException(
                 status_code=status.HTTP_403_FORBIDDEN,
                 detail=f"Operation not permitted. Required role: admin, hr, founder, or co-founder. Current role: {user_role_name}"
@@ -192,18 +186,19 @@ async def get_all_policies(
     """
     Get all policies with HTTP caching for static data. Excludes soft-deleted policies.
     """
+    # Documents for all policies in one extra IN query instead of one query per policy
     result = await db.execute(
-        select(Policy).where(Policy.is_deleted == False).order_by(Policy.year.desc())
+        load_policy_full(
+            select(Policy)
+            .where(Policy.is_deleted == False)
+            .order_by(Policy.year.desc())
+        )
     )
     policies_models = result.scalars().all()
     
     policies = []
     for p in policies_models:
-        # Fetch documents for this policy
-        documents_result = await db.execute(
-            select(PolicyDocumentModel).where(PolicyDocumentModel.policy_id == p.id)
-        )
-        documents_list = documents_result.scalars().all()
+        documents_list = p.policy_documents
         # Convert documents to PolicyDocumentSchema objects
         documents = [
             PolicyDocument(
@@ -450,7 +445,7 @@ async def upload_policy_document(
     UPLOAD_DIR = Path("static/uploads/policies")
     UPLOAD_DIR.mkdir(parents=True, exist_ok=True)
     
-    filename = f"{year}_{int(datetime.now().timestamp())}_{file.filename.replace(' ', '_')}"
+    filename = f"{year}_{uuid4().hex}_{file.filename.replace(' ', '_')}"
     file_path = UPLOAD_DIR / filename
     
     try:
@@ -632,31 +627,17 @@ async def acknowledge_policy(
     if not policy:
         raise HTTPException(status_code=404, detail=f"Policy for year {year} not found")
 
-    # Save or update acknowledgment for this specific document
-    user_id_int = current_user.id
-    result = await db.execute(
-        select(PolicyAcknowledgment).where(
-            and_(
-                PolicyAcknowledgment.user_id == user_id_int,
-                PolicyAcknowledgment.year == year,
-                PolicyAcknowledgment.document_url == document_url
-            )
-        )
+    # Save or update acknowledgment for this specific document in one statement:
+    # unique_user_document_year turns a repeat acknowledgment into an acknowledged_at refresh
+    ack_insert = mysql_insert(PolicyAcknowledgment).values(
+        user_id=current_user.id,
+        year=year,
+        document_url=document_url,
+        acknowledged_at=datetime.utcnow(),
+    )
+    await db.execute(
+        ack_insert.on_duplicate_key_update(acknowledged_at=ack_insert.inserted.acknowledged_at)
     )
-    existing_ack = result.scalar_one_or_none()
-    
-    if existing_ack:
-        # Update existing acknowledgment
-        existing_ack.acknowledged_at = datetime.utcnow()
-    else:
-        # Insert new acknowledgment
-        new_ack = PolicyAcknowledgment(
-            user_id=user_id_int,
-            year=year,
-            document_url=document_url,
-            acknowledged_at=datetime.utcnow()
-        )
-        db.add(new_ack)
 
     await audit_log_action(
         db,
@@ -759,12 +740,7 @@ async def get_acknowledgment_report(
         acknowledged_count = len(user_acks)
         
         # Get user's role
-        role_result = await db.execute(
-            select(Role.name)
-            .join(UserRoleModel, Role.id == UserRoleModel.role_id)
-            .where(and_(UserRoleModel.user_id == user.id, UserRoleModel.is_active == True))
-        )
-        role_name = role_result.scalar_one_or_none()
+        role_name = user.primary_role
         
         report.append({
             "user_id": user_id,
@@ -5,11 +5,11 @@ from datetime import datetime
 from backend.db import get_db, AsyncSessionLocal, ensure_database_exists, init_db
 from backend.models import User as UserModel, UserRole as UserRoleModel, Role, UserLeaveBalance, UserDocument, Policy, LeaveTypeEnum, UserSchema, StaffRole, JobLog
 from backend.models.enums import BalanceChangeTypeEnum, JobStatusEnum
-from backend.models.user import UserCreateAdmin, UserRole
+from backend.models.user import UserCreateAdmin, UserRole, load_user_full
 from backend.services.balance_history import record_balance_change
-from backend.utils.security import get_password_hash
+from backend.utils.security import get_password_hash_async
 from backend.routes.auth import get_current_user_email, get_optional_user_email, verify_admin, create_scope_dependency
-from backend.utils.scopes import Scope
+from backend.utils.scopes import Scope, ADMIN_ROLES
 from backend.utils.id_utils import to_int_id
 from backend.services.audit import log_action as audit_log_action
 from backend.services.seed import run_seed_roles, run_seed_admin, ADMIN_EMAIL, ADMIN_EMPLOYEE_ID
@@ -17,9 +17,11 @@ from backend.utils.action_log import log_user_action
 from fastapi import UploadFile, File
 from sqlalchemy import select, func, and_, or_  # type: ignore
 from sqlalchemy.ext.asyncio import AsyncSession  # type: ignore
+from sqlalchemy import inspect as sa_inspect  # type: ignore
 from sqlalchemy.orm import selectinload  # type: ignore
 import shutil
 from pathlib import Path
+from uuid import uuid4
 import os
 import json
 from sqlalchemy import desc  # type: ignore
@@ -29,25 +31,26 @@ from backend.services.scheduler import monthly_accrual
 logger = logging.getLogger(__name__)
 router = APIRouter(prefix="", tags=["Users"])
 
+def _is_loaded(obj, attr: str) -> bool:
+    """True if the relationship is already loaded (reading it will not trigger async lazy-load IO)."""
+    return attr not in sa_inspect(obj).unloaded
+
+
 async def user_model_to_pydantic(user: UserModel, db: AsyncSession) -> UserSchema:
-    """Convert SQLAlchemy UserModel to Pydantic User model"""
-    # Fetch user's active role
-    role_name = ""
-    user_role_result = await db.execute(
-        select(UserRoleModel, Role)
-        .join(Role, UserRoleModel.role_id == Role.id)
-        .where(UserRoleModel.user_id == user.id, UserRoleModel.is_active == True)
-        .limit(1)
-    )
-    user_role_record = user_role_result.first()
-    if user_role_record:
-        role_name = user_role_record[1].name.lower()  # Get role name and convert to lowercase
+    """
+    Convert SQLAlchemy UserModel to Pydantic User model.
+    Uses relationships loaded via load_user_full when present, otherwise queries them.
+    """
+    role_name = user.primary_role or ""
     
     # Fetch user's leave balances from user_leave_balances table
-    balance_result = await db.execute(
-        select(UserLeaveBalance).where(UserLeaveBalance.user_id == user.id)
-    )
-    balances = balance_result.scalars().all()
+    if _is_loaded(user, "leave_balances"):
+        balances = user.leave_balances
+    else:
+        balance_result = await db.execute(
+            select(UserLeaveBalance).where(UserLeaveBalance.user_id == user.id)
+        )
+        balances = balance_result.scalars().all()
     
     # Initialize balance values (default to 0.0)
     casual_balance = 0.0
@@ -73,17 +76,22 @@ async def user_model_to_pydantic(user: UserModel, db: AsyncSession) -> UserSchem
     # Fetch manager information if manager_id exists
     manager_name = None
     if user.manager_id:
-        manager_result = await db.execute(select(UserModel).where(UserModel.id == user.manager_id))
-        manager = manager_result.scalar_one_or_none()
+        if _is_loaded(user, "manager"):
+            manager = user.manager
+        else:
+            manager_result = await db.execute(select(UserModel).where(UserModel.id == user.manager_id))
+            manager = manager_result.scalar_one_or_none()
         if manager:
             manager_name = manager.full_name
     
     # Fetch user documents
-    
-    documents_result = await db.execute(
-        select(UserDocument).where(UserDocument.user_id == user.id).order_by(desc(UserDocument.uploaded_at))
-    )
-    documents_list = documents_result.scalars().all()
+    if _is_loaded(user, "documents"):
+        documents_list = user.documents
+    else:
+        documents_result = await db.execute(
+            select(UserDocument).where(UserDocument.user_id == user.id).order_by(desc(UserDocument.uploaded_at))
+        )
+        documents_list = documents_result.scalars().all()
     documents = []
     for doc in documents_list:
         # Extract saved_filename from URL (last part after /)
@@ -95,15 +103,12 @@ async def user_model_to_pydantic(user: UserModel, db: AsyncSession) -> UserSchem
             "saved_filename": saved_filename
         })
     
-    # Note: hashed_password is required by UserBase but we exclude it from responses
-    # We'll set it to empty string for security (it won't be serialized in responses)
     return UserSchema(
         id=user.id,
         email=user.email,
         full_name=user.full_name,
         employee_id=user.employee_id,
         role=role_name,  # Include role
-        hashed_password="",  # Excluded from responses via response_model_exclude
         is_active=user.is_active,
         reset_required=user.reset_required,
         manager_id=user.manager_id,
@@ -260,8 +265,8 @@ async def upload_profile_picture(
     UPLOAD_DIR = Path("static/uploads/profile_pictures")
     UPLOAD_DIR.mkdir(parents=True, exist_ok=True)
     
-    # Generate unique filename
-    filename = f"{current_user.id}_{int(datetime.now().timestamp())}{file_ext}"
+    # Generate unique filename (never reused, so /static can serve it as immutable)
+    filename = f"{current_user.id}_{uuid4().hex}{file_ext}"
     file_path = UPLOAD_DIR / filename
     
     try:
@@ -358,7 +363,7 @@ async def create_user_admin(
     # Password Handling
     if len(user_in.password) < 6:
         raise HTTPException(status_code=400, detail="Password must be at least 6 characters")
-    hashed_password = get_password_hash(user_in.password)
+    hashed_password = await get_password_hash_async(user_in.password)
     
     # Fetch active policy
     current_year = datetime.now().year
@@ -525,8 +530,8 @@ async def list_users(
     """
     List users with pagination and optional search.
     """
-    # Build query (eager-load profile to avoid async lazy-load in user_model_to_pydantic)
-    query = select(UserModel).options(selectinload(UserModel.profile))
+    # Build query (filters only; eager loads are added to the page query below)
+    query = select(UserModel)
     if search:
         # Case-insensitive search across name, email, employee_id
         search_pattern = f"%{search}%"
@@ -544,7 +549,8 @@ async def list_users(
     total = total_result.scalar() or 0
     
     # Fetch paginated users
-    query = query.order_by(UserModel.full_name).offset(skip).limit(limit)
+    # One IN query per relationship for the whole page instead of four queries per user
+    query = load_user_full(query.order_by(UserModel.full_name).offset(skip).limit(limit))
     result = await db.execute(query)
     users_list = result.scalars().all()
     
@@ -699,10 +705,9 @@ async def upload_documents(
         if file_ext not in ALLOWED_EXTENSIONS:
             continue # Skip invalid files
         
-        # Unique filename to prevent overwrite
-        timestamp = int(datetime.now().timestamp())
-        safe_filename = file.filename.replace(" ", "_") if file.filename else f"file_{timestamp}"
-        saved_filename = f"{timestamp}_{safe_filename}"
+        # Unique filename to prevent overwrite (a timestamp prefix collides for same-named files in one request)
+        safe_filename = file.filename.replace(" ", "_")
+        saved_filename = f"{uuid4().hex}_{safe_filename}"
         file_path = UPLOAD_DIR / saved_filename
         
         try:
@@ -802,25 +807,22 @@ async def get_job_status(
     yearly_scheduler_name = f"yearly_reset_{year}"
     yearly_manual_prefix = f"manual_yearly_reset_{year}_"
 
-    monthly_done = await db.execute(
-        select(JobLog).where(
-            and_(JobLog.job_name == monthly_job_name, JobLog.status == JobStatusEnum.SUCCESS)
-        )
-    )
-    yearly_scheduler = await db.execute(
-        select(JobLog).where(
-            and_(JobLog.job_name == yearly_scheduler_name, JobLog.status == JobStatusEnum.SUCCESS)
-        )
-    )
-    yearly_manual = await db.execute(
-        select(JobLog).where(
-            JobLog.job_name.like(f"{yearly_manual_prefix}%"),
+    # One query for all three checks, answered from idx_job_status (job_name, status)
+    result = await db.execute(
+        select(JobLog.job_name).where(
+            or_(
+                JobLog.job_name.in_((monthly_job_name, yearly_scheduler_name)),
+                JobLog.job_name.like(f"{yearly_manual_prefix}%"),
+            ),
             JobLog.status == JobStatusEnum.SUCCESS,
-        ).limit(1)
+        )
     )
+    done = set(result.scalars())
     return {
-        "monthly_accrual_run_this_month": monthly_done.scalar_one_or_none() is not None,
-        "yearly_reset_run_this_year": yearly_scheduler.scalar_one_or_none() is not None or yearly_manual.scalar_one_or_none() is not None,
+        "monthly_accrual_run_this_month": monthly_job_name in done,
+        "yearly_reset_run_this_year": yearly_scheduler_name in done or any(
+            name.startswith(yearly_manual_prefix) for name in done
+        ),
     }
 
 
@@ -1155,16 +1157,9 @@ async def _bootstrap_auth_optional(
     user = result.scalar_one_or_none()
     if not user:
         raise HTTPException(status_code=404, detail="User not found")
-    role_result = await db.execute(
-        select(UserRoleModel, Role)
-        .join(Role, UserRoleModel.role_id == Role.id)
-        .where(UserRoleModel.user_id == user.id, UserRoleModel.is_active == True)
-    )
-    row = role_result.first()
-    if not row:
+    if not user.primary_role:
         raise HTTPException(status_code=403, detail="User has no active role")
-    role_name = row[1].name.lower()
-    if role_name not in ("admin", "founder", "co_founder", "hr"):
+    if user.primary_role not in ADMIN_ROLES:
         raise HTTPException(status_code=403, detail="Admin/founder/co-founder/hr access required")
     return {"id": user.id, "email": user.email, "full_name": user.full_name, "employee_id": user.employee_id}
 
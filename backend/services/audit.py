@@ -1,28 +1,84 @@
 """
 Audit service: records user actions to the audit_logs table for compliance and support.
 Uses affected_entity_type / affected_entity_id for the record that was affected by the action.
+Entries are buffered on the session and written with one multi-row INSERT when it commits.
+Entries of requests that write nothing else (login) go through an in-process queue instead, drained by
+one writer task that inserts them in batches.
 """
-from datetime import date, datetime
-from typing import Any, Optional
+import asyncio
+import logging
+import os
+from typing import Any, Dict, List, Optional, Set
+from sqlalchemy import event, insert  # type: ignore
 from sqlalchemy.ext.asyncio import AsyncSession  # type: ignore
+from sqlalchemy.orm import Session  # type: ignore
+from backend.db import AsyncSessionLocal
 from backend.models import AuditLog
 
+logger = logging.getLogger(__name__)
 
-def _json_safe(obj: Any) -> Any:
-    """Convert values to JSON-serializable form for MySQL JSON column."""
-    if obj is None:
-        return None
-    if isinstance(obj, dict):
-        return {k: _json_safe(v) for k, v in obj.items()}
-    if isinstance(obj, (list, tuple)):
-        return [_json_safe(v) for v in obj]
-    if isinstance(obj, (datetime, date)):
-        return obj.isoformat() if hasattr(obj, "isoformat") else str(obj)
-    if hasattr(obj, "value"):  # enum
-        return obj.value
-    if isinstance(obj, (str, int, float, bool)):
-        return obj
-    return str(obj)
+# session.info key holding audit rows not yet written in the current transaction
+_AUDIT_ROWS_KEY = "audit_rows"
+
+# Queued (detached) entries: written once AUDIT_BATCH_SIZE are waiting or AUDIT_FLUSH_SECONDS after the
+# first of a batch arrived, whichever comes first
+AUDIT_BATCH_SIZE = int(os.getenv("AUDIT_BATCH_SIZE", "200"))
+AUDIT_FLUSH_SECONDS = float(os.getenv("AUDIT_FLUSH_SECONDS", "2"))
+_AUDIT_QUEUE_MAXSIZE = 10000
+
+_audit_queue: Optional["asyncio.Queue[Optional[Dict[str, Any]]]"] = None
+_audit_writer: Optional[asyncio.Task] = None
+# Direct writes made when the queue is unavailable; referenced until done so they are not collected
+_direct_writes: Set[asyncio.Task] = set()
+
+
+@event.listens_for(Session, "before_commit")
+def _write_buffered_audit_rows(session: Session) -> None:
+    """Insert all audit rows buffered in this transaction as one executemany, right before COMMIT."""
+    rows = session.info.pop(_AUDIT_ROWS_KEY, None)
+    if rows:
+        # Pending objects first: audit rows may reference users/leaves created in the same transaction
+        session.flush()
+        session.execute(insert(AuditLog), rows)
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_buffered_audit_rows(session: Session) -> None:
+    session.info.pop(_AUDIT_ROWS_KEY, None)
+
+
+def _audit_row(
+    action: str,
+    affected_entity_type: str,
+    *,
+    user_id: Optional[int] = None,
+    affected_entity_id: Optional[int] = None,
+    old_values: Optional[dict[str, Any]] = None,
+    new_values: Optional[dict[str, Any]] = None,
+    actor_email: Optional[str] = None,
+    actor_employee_id: Optional[str] = None,
+    actor_full_name: Optional[str] = None,
+    actor_role: Optional[str] = None,
+    summary: Optional[str] = None,
+    request_method: Optional[str] = None,
+    request_path: Optional[str] = None,
+) -> Dict[str, Any]:
+    """audit_logs row as a dict; every row has every key so a batch is one executemany."""
+    return {
+        "user_id": user_id,
+        "action": action,
+        "affected_entity_type": affected_entity_type,
+        "affected_entity_id": affected_entity_id,
+        "old_values": old_values,
+        "new_values": new_values,
+        "actor_email": actor_email,
+        "actor_employee_id": actor_employee_id,
+        "actor_full_name": actor_full_name,
+        "actor_role": actor_role,
+        "summary": summary,
+        "request_method": request_method,
+        "request_path": request_path,
+    }
 
 
 async def log_action(
@@ -43,27 +99,105 @@ async def log_action(
     request_path: Optional[str] = None,
 ) -> None:
     """
-    Write an audit log entry. Call before commit (same transaction).
+    Write an audit log entry. Call before commit (same transaction): the entry is buffered on the
+    session and inserted together with the transaction's other entries when it commits.
     affected_entity_type = kind of record affected (USER, LEAVE, POLICY, HOLIDAY, COMP_OFF, JOB, BALANCE).
     affected_entity_id   = primary key of that record (e.g. leave id, user id).
+    old_values/new_values are stored as given: the engine's orjson serializer encodes dates, enums and
+    Decimals itself, so no pre-conversion pass is needed.
     """
-    # Ensure old_values/new_values are JSON-serializable for MySQL
-    old_safe = _json_safe(old_values) if old_values is not None else None
-    new_safe = _json_safe(new_values) if new_values is not None else None
-
-    entry = AuditLog(
-        user_id=user_id,
-        action=action,
-        affected_entity_type=affected_entity_type,
-        affected_entity_id=affected_entity_id,
-        old_values=old_safe,
-        new_values=new_safe,
-        actor_email=actor_email,
-        actor_employee_id=actor_employee_id,
-        actor_full_name=actor_full_name,
-        actor_role=actor_role,
-        summary=summary,
-        request_method=request_method,
-        request_path=request_path,
+    db.info.setdefault(_AUDIT_ROWS_KEY, []).append(
+        _audit_row(
+            action,
+            affected_entity_type,
+            user_id=user_id,
+            affected_entity_id=affected_entity_id,
+            old_values=old_values,
+            new_values=new_values,
+            actor_email=actor_email,
+            actor_employee_id=actor_employee_id,
+            actor_full_name=actor_full_name,
+            actor_role=actor_role,
+            summary=summary,
+            request_method=request_method,
+            request_path=request_path,
+        )
     )
-    db.add(entry)
+
+
+def log_action_background(action: str, affected_entity_type: str, **fields: Any) -> None:
+    """
+    Queue an audit entry to be written outside the request, batched with others (same fields as log_action).
+    Only for requests that make no other writes (login): audit rows of a write belong in its transaction.
+    Must be called from the event loop. Without a running writer (or with a full queue) the entry is
+    written on its own instead.
+    """
+    row = _audit_row(action, affected_entity_type, **fields)
+    if _audit_queue is not None:
+        try:
+            _audit_queue.put_nowait(row)
+            return
+        except asyncio.QueueFull:
+            logger.warning("Audit queue full; writing %s entry directly", action)
+    task = asyncio.get_running_loop().create_task(_write_audit_rows([row]))
+    _direct_writes.add(task)
+    task.add_done_callback(_direct_writes.discard)
+
+
+async def _write_audit_rows(rows: List[Dict[str, Any]]) -> None:
+    """Insert rows as one executemany in their own transaction; failures are logged, not raised."""
+    try:
+        async with AsyncSessionLocal() as db:
+            await db.execute(insert(AuditLog), rows)
+            await db.commit()
+    except Exception:
+        logger.exception("Failed to write %d audit entries", len(rows))
+
+
+async def _run_audit_writer(queue: "asyncio.Queue[Optional[Dict[str, Any]]]") -> None:
+    """Collect queued rows into batches and write each batch; returns after the None sentinel."""
+    loop = asyncio.get_running_loop()
+    stopping = False
+    while not stopping:
+        row = await queue.get()
+        if row is None:
+            return
+        batch = [row]
+        deadline = loop.time() + AUDIT_FLUSH_SECONDS
+        while len(batch) < AUDIT_BATCH_SIZE:
+            timeout = deadline - loop.time()
+            if timeout <= 0:
+                break
+            try:
+                row = await asyncio.wait_for(queue.get(), timeout)
+            except asyncio.TimeoutError:
+                break
+            if row is None:
+                stopping = True
+                break
+            batch.append(row)
+        await _write_audit_rows(batch)
+
+
+def start_audit_writer() -> None:
+    """Create the queue and start the batch writer (application startup)."""
+    global _audit_queue, _audit_writer
+    if _audit_writer is not None:
+        return
+    _audit_queue = asyncio.Queue(maxsize=_AUDIT_QUEUE_MAXSIZE)
+    _audit_writer = asyncio.get_running_loop().create_task(_run_audit_writer(_audit_queue))
+
+
+async def stop_audit_writer() -> None:
+    """Write everything still queued and stop the writer (application shutdown, before the engine is closed)."""
+    global _audit_queue, _audit_writer
+    queue, writer = _audit_queue, _audit_writer
+    if writer is None:
+        return
+    # New entries from here on are written directly; the sentinel goes behind everything already queued
+    _audit_queue = None
+    _audit_writer = None
+    await queue.put(None)
+    await writer
+    if _direct_writes:
+        await asyncio.gather(*_direct_writes)
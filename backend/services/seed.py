@@ -20,7 +20,7 @@ from backend.models import (
 )
 from backend.models.user import UserRole as UserRoleEnum
 from backend.utils.scopes import ROLE_SCOPES
-from backend.utils.security import get_password_hash
+from backend.utils.security import get_password_hash_async
 
 
 # Admin credentials (from .env, with fallbacks)
@@ -89,7 +89,7 @@ async def run_seed_admin(db: AsyncSession) -> bool:
         employee_id=ADMIN_EMPLOYEE_ID,
         email=ADMIN_EMAIL,
         full_name=ADMIN_FULL_NAME,
-        hashed_password=get_password_hash(ADMIN_PASSWORD),
+        hashed_password=await get_password_hash_async(ADMIN_PASSWORD),
         is_active=True,
         reset_required=False,
         joining_date=date.today(),
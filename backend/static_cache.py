@@ -0,0 +1,113 @@
+"""
+In-memory cache for the /static mount.
+Small files under the static directory are read into memory at startup and served from there;
+each hit only stats the file (so replaced or deleted uploads are never served stale) instead of
+stat + open + read. Larger files, and anything not cached, go through StaticFiles as usual.
+"""
+import hashlib
+import logging
+import mimetypes
+import os
+from email.utils import formatdate
+from typing import Dict, NamedTuple, Optional
+
+from starlette.datastructures import Headers  # type: ignore
+from starlette.responses import Response  # type: ignore
+from starlette.staticfiles import NotModifiedResponse, StaticFiles  # type: ignore
+from starlette.types import Scope  # type: ignore
+
+logger = logging.getLogger(__name__)
+
+# Files larger than this are always served from disk
+DEFAULT_MAX_FILE_SIZE = 1024 * 1024
+# Upper bound on total bytes held in memory
+DEFAULT_MAX_CACHE_SIZE = 64 * 1024 * 1024
+
+
+class _CachedFile(NamedTuple):
+    body: bytes
+    headers: Dict[str, str]
+    mtime: float
+    size: int
+
+
+class CachedStatic(StaticFiles):
+    """StaticFiles that preloads small files into memory and serves GET hits from the cache."""
+
+    def __init__(
+        self,
+        *,
+        directory: str,
+        max_file_size: int = DEFAULT_MAX_FILE_SIZE,
+        max_cache_size: int = DEFAULT_MAX_CACHE_SIZE,
+        **kwargs,
+    ) -> None:
+        super().__init__(directory=directory, **kwargs)
+        self.max_file_size = max_file_size
+        self.max_cache_size = max_cache_size
+        self._cache: Dict[str, _CachedFile] = {}
+        self._cache_bytes = 0
+        self._preload(directory)
+
+    def _preload(self, directory: str) -> None:
+        """Walk the directory once and cache every regular file up to max_file_size (symlinks skipped)."""
+        if not os.path.isdir(directory):
+            return
+        for root, _dirs, files in os.walk(directory):
+            for name in files:
+                full_path = os.path.join(root, name)
+                if os.path.islink(full_path):
+                    continue
+                self._load(os.path.normpath(os.path.relpath(full_path, directory)), full_path)
+        logger.info(f"Static cache: {len(self._cache)} files, {self._cache_bytes} bytes from {directory}")
+
+    def _load(self, path: str, full_path: str) -> Optional[_CachedFile]:
+        try:
+            stat_result = os.stat(full_path)
+            if stat_result.st_size > self.max_file_size:
+                return None
+            if self._cache_bytes + stat_result.st_size > self.max_cache_size:
+                return None
+            with open(full_path, "rb") as f:
+                body = f.read()
+        except OSError:
+            return None
+        # Same ETag / Last-Modified values FileResponse would send for this file
+        etag_base = f"{stat_result.st_mtime}-{stat_result.st_size}"
+        headers = {
+            "content-type": mimetypes.guess_type(full_path)[0] or "text/plain",
+            "etag": f'"{hashlib.md5(etag_base.encode(), usedforsecurity=False).hexdigest()}"',
+            "last-modified": formatdate(stat_result.st_mtime, usegmt=True),
+        }
+        entry = _CachedFile(body, headers, stat_result.st_mtime, stat_result.st_size)
+        self._cache[path] = entry
+        self._cache_bytes += len(body)
+        return entry
+
+    def _evict(self, path: str) -> None:
+        entry = self._cache.pop(path, None)
+        if entry is not None:
+            self._cache_bytes -= len(entry.body)
+
+    async def get_response(self, path: str, scope: Scope) -> Response:
+        entry = self._cache.get(path)
+        if entry is None or scope["method"] != "GET":
+            return await super().get_response(path, scope)
+
+        full_path = os.path.join(self.directory, path)
+        try:
+            stat_result = os.stat(full_path)
+        except OSError:
+            # Deleted since it was cached
+            self._evict(path)
+            return await super().get_response(path, scope)
+        if stat_result.st_mtime != entry.mtime or stat_result.st_size != entry.size:
+            self._evict(path)
+            entry = self._load(path, full_path)
+            if entry is None:
+                return await super().get_response(path, scope)
+
+        response = Response(entry.body, headers=entry.headers)
+        if self.is_not_modified(response.headers, Headers(scope=scope)):
+            return NotModifiedResponse(response.headers)
+        return response
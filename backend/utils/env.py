@@ -0,0 +1,13 @@
+"""
+Environment loading.
+.env is read once per process no matter how many modules (main, db, security, alembic env) ask for it.
+"""
+import functools
+
+from dotenv import load_dotenv
+
+
+@functools.lru_cache(maxsize=1)
+def load_env() -> bool:
+    """Load .env into os.environ (existing variables win). Cached: later calls are no-ops."""
+    return load_dotenv()
@@ -1,41 +1,85 @@
 """
 Centralized logging configuration for the application.
 Logs to both console and a rotating file (logs/app.log).
+Set json_format=True (LOG_FORMAT=json) for one JSON object per line, encoded with orjson when installed.
+Handlers run on a background QueueListener thread; the root logger only enqueues records, so console
+and file writes never block the event loop.
 """
+import json
 import logging
+import queue
 import sys
 from pathlib import Path
-from logging.handlers import RotatingFileHandler
+from logging.handlers import QueueHandler, QueueListener, RotatingFileHandler
+from typing import Optional
 
 LOG_DIR = Path(__file__).resolve().parent.parent.parent / "logs"
 LOG_FILE = LOG_DIR / "app.log"
 MAX_BYTES = 5 * 1024 * 1024  # 5 MB
 BACKUP_COUNT = 5
 
+# Background thread writing queued records to the real handlers (started by setup_logging)
+_listener: Optional[QueueListener] = None
+
 FORMAT_CONSOLE = "%(asctime)s | %(levelname)-7s | %(name)s | %(message)s"
 FORMAT_FILE = "%(asctime)s | %(levelname)-7s | %(name)s | %(filename)s:%(lineno)d | %(message)s"
 DATE_FMT = "%Y-%m-%d %H:%M:%S"
 
+try:
+    import orjson  # type: ignore
+
+    def _dumps(obj) -> str:
+        return orjson.dumps(obj, default=str).decode()
+except ImportError:
+    def _dumps(obj) -> str:
+        return json.dumps(obj, default=str, separators=(",", ":"))
+
+
+class JSONFormatter(logging.Formatter):
+    """
+    One JSON object per record: t(ime), l(evel), n(ame), msg.
+    Structured fields passed as extra={"http": {...}} (request log) are emitted as-is under "http".
+    """
+
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {
+            "t": self.formatTime(record, self.datefmt),
+            "l": record.levelname,
+            "n": record.name,
+            "msg": record.getMessage(),
+        }
+        http = getattr(record, "http", None)
+        if http is not None:
+            entry["http"] = http
+        if record.exc_info:
+            entry["exc"] = self.formatException(record.exc_info)
+        return _dumps(entry)
 
-def setup_logging(level: str = "INFO") -> None:
-    """Configure root logger with console and rotating file handlers."""
+
+def setup_logging(level: str = "INFO", json_format: bool = False) -> None:
+    """Configure root logger with console and rotating file handlers (text or JSON lines)."""
+    global _listener
     level_value = getattr(logging, level.upper(), logging.INFO)
     root = logging.getLogger()
     root.setLevel(level_value)
 
-    # Avoid duplicate handlers when reloading
-    if root.handlers:
+    # Configure once per process: a second call (re-import, reload) must not stack another set of handlers
+    if _listener is not None or root.handlers:
         return
 
     LOG_DIR.mkdir(parents=True, exist_ok=True)
 
-    fmt_console = logging.Formatter(FORMAT_CONSOLE, datefmt=DATE_FMT)
-    fmt_file = logging.Formatter(FORMAT_FILE, datefmt=DATE_FMT)
+    if json_format:
+        fmt_console = fmt_file = JSONFormatter(datefmt=DATE_FMT)
+    else:
+        fmt_console = logging.Formatter(FORMAT_CONSOLE, datefmt=DATE_FMT)
+        fmt_file = logging.Formatter(FORMAT_FILE, datefmt=DATE_FMT)
 
+    handlers = []
     console = logging.StreamHandler(sys.stdout)
     console.setLevel(level_value)
     console.setFormatter(fmt_console)
-    root.addHandler(console)
+    handlers.append(console)
 
     try:
         file_handler = RotatingFileHandler(
@@ -46,10 +90,25 @@ def setup_logging(level: str = "INFO") -> None:
         )
         file_handler.setLevel(level_value)
         file_handler.setFormatter(fmt_file)
-        root.addHandler(file_handler)
+        handlers.append(file_handler)
     except OSError:
+        file_handler = None
+
+    log_queue: queue.Queue = queue.Queue(-1)
+    root.addHandler(QueueHandler(log_queue))
+    _listener = QueueListener(log_queue, *handlers, respect_handler_level=True)
+    _listener.start()
+    if file_handler is None:
         root.warning("Could not create log file %s; file logging disabled", LOG_FILE)
 
     # Reduce noise from third-party loggers
     logging.getLogger("uvicorn.access").setLevel(logging.WARNING)
     logging.getLogger("sqlalchemy.engine").setLevel(logging.WARNING)
+
+
+def stop_logging() -> None:
+    """Flush queued records and stop the background listener (call on shutdown)."""
+    global _listener
+    if _listener is not None:
+        _listener.stop()
+        _listener = None
@@ -2,7 +2,7 @@
 OAuth2 Scope definitions and role-to-scope mapping.
 Provides fine-grained permission control based on OAuth2 standards.
 """
-from typing import List
+from typing import Dict, FrozenSet, List, Tuple
 from backend.models.user import UserRole
 
 
@@ -35,7 +35,15 @@ class Scope:
     EXPORT_DATA = "export:data"
 
 
-# Map roles to their default scopes
+# Roles allowed through admin-only checks (verify_admin, "god mode" approvals). Compared against
+# users.primary_role, which is stored lower-case, so no per-request lowercasing is needed
+ADMIN_ROLES: FrozenSet[str] = frozenset(
+    {UserRole.ADMIN.value, UserRole.FOUNDER.value, UserRole.CO_FOUNDER.value, UserRole.HR.value}
+)
+
+
+# Map roles to their default scopes. This in-memory table is the source of truth at runtime: scopes are
+# granted from it at login and carried in the JWT; role_scopes in the database is only its seeded copy
 ROLE_SCOPES = {
     UserRole.EMPLOYEE: [
         Scope.READ_LEAVES,
@@ -143,7 +151,11 @@ ROLE_SCOPES = {
 }
 
 
-def get_scopes_for_role(role: UserRole) -> List[str]:
+# Frozen once at import: login hands these out without building a list, and callers cannot mutate them
+_SCOPES_BY_ROLE: Dict[UserRole, Tuple[str, ...]] = {role: tuple(scopes) for role, scopes in ROLE_SCOPES.items()}
+
+
+def get_scopes_for_role(role: UserRole) -> Tuple[str, ...]:
     """
     Get default scopes for a given role.
     
@@ -151,9 +163,9 @@ def get_scopes_for_role(role: UserRole) -> List[str]:
         role: UserRole enum value
         
     Returns:
-        List of scope strings for the role
+        Tuple of scope strings for the role (shared and immutable; empty for an unmapped role)
     """
-    return ROLE_SCOPES.get(role, [])
+    return _SCOPES_BY_ROLE.get(role, ())
 
 
 def has_scope(token_scopes: List[str], required_scope: str) -> bool:
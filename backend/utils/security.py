@@ -1,30 +1,102 @@
-from datetime import datetime, timedelta
+from collections import OrderedDict
+from datetime import timedelta
 import os
-from typing import Optional
+import secrets
+import time
+from typing import Optional, Tuple
 from passlib.context import CryptContext
 from jose import jwt
-from dotenv import load_dotenv
+from jose.exceptions import ExpiredSignatureError
+from starlette.concurrency import run_in_threadpool  # type: ignore
+from backend.utils.env import load_env
 
-load_dotenv()
+load_env()
 
 SECRET_KEY = os.getenv("SECRET_KEY", "your_super_secret_key")
 ALGORITHM = os.getenv("ALGORITHM", "HS256")
 ACCESS_TOKEN_EXPIRE_MINUTES = int(os.getenv("ACCESS_TOKEN_EXPIRE_MINUTES", 30))
 
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+# New hashes are Argon2id; existing bcrypt hashes still verify and are re-hashed on the next login
+pwd_context = CryptContext(
+    schemes=["argon2", "bcrypt"],
+    deprecated="auto",
+    argon2__type="ID",
+    argon2__time_cost=int(os.getenv("ARGON2_TIME_COST", "3")),
+    argon2__memory_cost=int(os.getenv("ARGON2_MEMORY_COST", "65536")),
+    argon2__parallelism=int(os.getenv("ARGON2_PARALLELISM", "4")),
+)
+
+# HMAC (HS*) verification takes microseconds - less than a threadpool hand-off - so it stays on the event
+# loop; RSA/EC signature checks are slow enough to block it and go to the threadpool
+_OFFLOAD_JWT_DECODE = not ALGORITHM.upper().startswith("HS")
+
+# Verified payloads by token string (LRU). A token's claims cannot change, so a hit only re-checks exp.
+# Only touched from the event loop; jwt.decode itself may run in the threadpool.
+TOKEN_CACHE_SIZE = int(os.getenv("TOKEN_CACHE_SIZE", "2048"))
+_token_cache: "OrderedDict[str, dict]" = OrderedDict()
 
 def verify_password(plain_password, hashed_password):
     return pwd_context.verify(plain_password, hashed_password)
 
+def verify_and_update_password(plain_password, hashed_password) -> Tuple[bool, Optional[str]]:
+    """Verify a password; the second item is a new hash when the stored one is bcrypt or outdated Argon2 parameters."""
+    return pwd_context.verify_and_update(plain_password, hashed_password)
+
 def get_password_hash(password):
     return pwd_context.hash(password)
 
+# Hashing and verifying deliberately burn tens to hundreds of ms of CPU; the async variants run them in the
+# threadpool so concurrent requests are not serialized behind them (argon2-cffi and bcrypt release the GIL)
+async def verify_password_async(plain_password, hashed_password) -> bool:
+    return await run_in_threadpool(verify_password, plain_password, hashed_password)
+
+async def verify_and_update_password_async(plain_password, hashed_password) -> Tuple[bool, Optional[str]]:
+    return await run_in_threadpool(verify_and_update_password, plain_password, hashed_password)
+
+async def get_password_hash_async(password) -> str:
+    return await run_in_threadpool(get_password_hash, password)
+
+# Hash of a random secret, made once on first use. Verifying against it when an email is unknown makes a
+# failed login cost the same as a wrong password, so response time does not reveal which emails exist.
+_dummy_password_hash: Optional[str] = None
+
+async def verify_dummy_password_async(plain_password) -> bool:
+    """Spend one password verification without a stored hash; always False."""
+    global _dummy_password_hash
+    if _dummy_password_hash is None:
+        _dummy_password_hash = await get_password_hash_async(secrets.token_urlsafe(32))
+    await verify_password_async(plain_password, _dummy_password_hash)
+    return False
+
 def create_access_token(data: dict, expires_delta: Optional[timedelta] = None):
     to_encode = data.copy()
-    if expires_delta:
-        expire = datetime.utcnow() + expires_delta
-    else:
-        expire = datetime.utcnow() + timedelta(minutes=ACCESS_TOKEN_EXPIRE_MINUTES)
-    to_encode.update({"exp": expire})
+    lifetime = expires_delta.total_seconds() if expires_delta else ACCESS_TOKEN_EXPIRE_MINUTES * 60
+    # exp is NumericDate (Unix seconds): taken straight from time.time(), the same clock the cached check uses
+    to_encode["exp"] = int(time.time() + lifetime)
     encoded_jwt = jwt.encode(to_encode, SECRET_KEY, algorithm=ALGORITHM)
     return encoded_jwt
+
+
+async def decode_access_token(token: str) -> dict:
+    """
+    Verify and decode an access token; raises jose.JWTError if invalid or expired.
+    The returned payload is shared with the cache - read it, do not mutate it.
+    """
+    payload = _token_cache.get(token)
+    if payload is not None:
+        exp = payload.get("exp")
+        if exp is not None and exp <= time.time():
+            del _token_cache[token]
+            raise ExpiredSignatureError("Signature has expired.")
+        _token_cache.move_to_end(token)
+        return payload
+
+    if _OFFLOAD_JWT_DECODE:
+        payload = await run_in_threadpool(jwt.decode, token, SECRET_KEY, algorithms=[ALGORITHM])
+    else:
+        payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
+    # Invalid tokens raise above and are never cached
+    _token_cache[token] = payload
+    if len(_token_cache) > TOKEN_CACHE_SIZE:
+        _token_cache.popitem(last=False)
+    return payload
@@ -0,0 +1,74 @@
+"""FastCORSMiddleware must send the same raw response headers as Starlette's CORSMiddleware."""
+import pytest
+
+pytest.importorskip("starlette")
+pytest.importorskip("httpx")
+
+from starlette.applications import Starlette  # type: ignore  # noqa: E402
+from starlette.middleware.cors import CORSMiddleware  # type: ignore  # noqa: E402
+from starlette.responses import PlainTextResponse  # type: ignore  # noqa: E402
+from starlette.routing import Route  # type: ignore  # noqa: E402
+from starlette.testclient import TestClient  # type: ignore  # noqa: E402
+
+from backend.middleware.fast_cors import FastCORSMiddleware  # noqa: E402
+
+ORIGINS = ["http://localhost:3000", "http://127.0.0.1:3000"]
+
+
+async def plain(request):
+    return PlainTextResponse("ok")
+
+
+async def with_cors_headers(request):
+    # App-set Vary and CORS headers: the middleware must merge / replace them, not append duplicates
+    return PlainTextResponse(
+        "ok",
+        headers={
+            "Vary": "Accept-Encoding",
+            "Access-Control-Allow-Credentials": "false",
+            "Access-Control-Allow-Origin": "http://example.com",
+        },
+    )
+
+
+def _app():
+    return Starlette(routes=[Route("/plain", plain), Route("/with-cors-headers", with_cors_headers)])
+
+
+def _stock_client():
+    app = _app()
+    app.add_middleware(
+        CORSMiddleware, allow_origins=ORIGINS, allow_credentials=True, allow_methods=["*"], allow_headers=["*"]
+    )
+    return TestClient(app)
+
+
+def _fast_client():
+    app = _app()
+    app.add_middleware(FastCORSMiddleware, origins=ORIGINS)
+    return TestClient(app)
+
+
+@pytest.mark.parametrize("path", ["/plain", "/with-cors-headers"])
+@pytest.mark.parametrize(
+    "request_headers",
+    [{}, {"Origin": "http://evil.example"}, {"Origin": "http://localhost:3000"}],
+    ids=["no-origin", "disallowed-origin", "allowed-origin"],
+)
+def test_simple_response_headers_match_starlette(path, request_headers):
+    stock = _stock_client().get(path, headers=request_headers)
+    fast = _fast_client().get(path, headers=request_headers)
+    assert fast.status_code == stock.status_code
+    assert fast.headers.raw == stock.headers.raw
+
+
+def test_preflight_matches_starlette():
+    request_headers = {
+        "Origin": "http://localhost:3000",
+        "Access-Control-Request-Method": "POST",
+        "Access-Control-Request-Headers": "authorization, content-type",
+    }
+    stock = _stock_client().options("/plain", headers=request_headers)
+    fast = _fast_client().options("/plain", headers=request_headers)
+    assert fast.status_code == stock.status_code
+    assert fast.headers.raw == stock.headers.raw